@@ -0,0 +1,52 @@
+"""Scaling benchmark of the export's lemma deduplication, with an inflector that
+does no work; the time per term should stay flat as the vocabulary grows.
+
+Run with ``python benchmarks/export_dedupe.py``.
+"""
+
+from collections.abc import Iterator
+from time import perf_counter
+
+from duo_scrapo.Morf import Lemma, Word
+from duo_scrapo.export import Classified, SomeForm, SomeType, Stats, export_classified
+from duo_scrapo.słowa.przysłówki import FormyPrzysłówków
+from duo_scrapo.słowa.słownictwo import TermDefinition
+
+
+FORMS = FormyPrzysłówków(form="")
+
+
+def vocabulary(size: int) -> Iterator[tuple[TermDefinition, Classified]]:
+    for i in range(size):
+        lemma = Lemma(word=f"lemat{i * 3 // 4}", tags="")
+        term = TermDefinition(term=lemma.word, definition=lemma.word)
+        yield (term, [
+            (Word(lemma.word, lemma, tags="subst:sg:nom:m3"), ["noun"]),
+            (Word(lemma.word, lemma, tags="inf:imperf"), ["verb"]),
+            (Word(lemma.word, lemma, tags="interj"), [] if i % 10 else ["adverb"]),
+        ])
+
+
+def inflector(kind: SomeType, thing: Word) -> SomeForm | None:
+    return None if kind == "adverb" else FORMS
+
+
+def run(size: int) -> float:
+    data = list(vocabulary(size))
+    stats = Stats(vocab_count=size)
+
+    start = perf_counter()
+    for _ in export_classified(data, inflector, stats):
+        pass
+    return perf_counter() - start
+
+
+def main() -> None:
+    print(f"{'terms':>8} {'total (ms)':>12} {'per term (us)':>15}")
+    for size in (1_000, 10_000, 100_000):
+        seconds = run(size)
+        print(f"{size:>8} {seconds * 1e3:>12.1f} {seconds / size * 1e6:>15.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""Micro-benchmark of the frozenset-backed ``Tag`` against the int-backed ``BitTag``.
+
+Run with ``python benchmarks/tag_ops.py``.
+"""
+
+from collections.abc import Callable
+from timeit import repeat
+
+from duo_scrapo.Morf import NOUN, tags_from_str
+from duo_scrapo.tag import BitTag, Tag
+
+
+TAGS = tags_from_str("subst:pl:nom.acc.voc:m2")
+MASK = BitTag.mask_of(TAGS)
+BITS = BitTag.from_values(TAGS)
+
+CASES = {
+    "subset test": (
+        lambda: TAGS >= Tag.NOUN,
+        lambda: BITS >= BitTag.NOUN,
+        lambda: MASK & NOUN == NOUN,
+    ),
+    "intersection": (
+        lambda: Tag.Number & TAGS,
+        lambda: BitTag.Number & BITS,
+        lambda: MASK & BitTag.Number.value,
+    ),
+    "union": (
+        lambda: Tag.SINGULAR | Tag.PLURAL,
+        lambda: BitTag.SINGULAR | BitTag.PLURAL,
+        lambda: BitTag.SINGULAR.value | BitTag.PLURAL.value,
+    ),
+}
+
+
+def best(stmt: Callable[[], object], number: int) -> float:
+    return min(repeat(stmt, number=number, repeat=5)) / number * 1e9
+
+
+def main(number: int = 100_000) -> None:
+    print(f"{'operation':<14} {'Tag':>10} {'BitTag':>10} {'int':>10}  (ns/op)")
+    for name, (flag, bit_flag, mask) in CASES.items():
+        print(f"{name:<14} {best(flag, number):>10.1f} {best(bit_flag, number):>10.1f} {best(mask, number):>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,12 @@
-from functools import reduce
-from typing import Literal, Self
-from collections.abc import Iterable, Iterator, Set, Hashable
+from bisect import bisect_right
+from collections import Counter
+from functools import lru_cache
+from pathlib import Path
+from threading import RLock
+from typing import Any, Literal, Self
+import json
+import sys
+from collections.abc import Callable, Iterable, Iterator, Mapping, MutableSet, Set, Hashable
 
 from morfeusz2 import Morfeusz
 from attrs import define, field
@@ -10,15 +16,25 @@ from duo_scrapo.słowa import GenderedSingular, FormyPrzypadków
 from duo_scrapo.słowa.przyimki import BasePrepositionForms, FormyPrzyimków
 from duo_scrapo.słowa.zaimki import FormyZaimków
 
-from .tag import Tag
+from .cache import DiskCache, LRUCache
+from .metrics import Histogram
+from .paradigm import CASES, fill_all, pronoun_preference
+from .registry import DICT_PATH, REGISTRY, MorfeuszOptions
+from .tag import BitTag, Tag
 from duo_scrapo.słowa.rzeczowniki import FormyRzeczowników
 from duo_scrapo.słowa.czasowniki import FormyCzasowników
 
 
-@define(hash=True)
+# Bounds of the parse caches: enough for the lemmas of a paradigm batch and for every
+# tag the dictionaries use, without keeping every string ever parsed alive.
+LEMMA_CACHE_SIZE = 1 << 16
+TAG_CACHE_SIZE = 1 << 13
+
+
+@define(frozen=True, cache_hash=True)
 class Lemma:
-    word: str = field()
-    tags: str = field(kw_only=True)
+    word: str = field(converter=sys.intern)
+    tags: str = field(kw_only=True, converter=sys.intern)
 
     def to_str(self: Self) -> str:
         return ":".join(list(filter(None, [self.word, self.tags])))
@@ -37,46 +53,97 @@ class Lemma:
         return len(m) + 1
 
     @classmethod
+    @lru_cache(maxsize=LEMMA_CACHE_SIZE)
     def from_str(cls: type[Self], string: str):
+        """Parse ``word:tags``. Lemmas are immutable, so the forms of a recently parsed lemma share one instance."""
         (word, tags) = string.split(":") if ":" in string else (string, "")
         return cls(word=word, tags=tags)
 
 
+@lru_cache(maxsize=TAG_CACHE_SIZE)
 def tags_from_str(string: str) -> Set[str]:
-    return frozenset({t for tag in string.split(":") for t in tag.split(".")})
+    """Parse a Morfeusz tag; equal tags share one frozenset of interned values."""
+    return frozenset({sys.intern(t) for tag in string.split(":") for t in tag.split(".")})
+
+
+@lru_cache(maxsize=TAG_CACHE_SIZE)
+def tags_mask(tags: Set[str]) -> int:
+    return BitTag.mask_of(tags)
+
+
+@lru_cache(maxsize=TAG_CACHE_SIZE)
+def _shared(values: tuple[str, ...]) -> frozenset[str]:
+    return frozenset(values)
+
+
+def qualifiers(values: Iterable[str]) -> frozenset[str]:
+    return _shared(tuple(values))
+
+
+ADJECTIVE = BitTag.mask_of(Tag.ADJECTIVE.value)
+ADVERB = BitTag.mask_of(Tag.ADVERB.value)
+NOUN = BitTag.mask_of(Tag.NOUN.value)
+INFINITIVE = BitTag.mask_of(Tag.INFINITIVE.value)
+PPRON12 = BitTag.mask_of(Tag.PPRON12.value)
+PPRON3 = BitTag.mask_of(Tag.PPRON3.value)
+PREPOSITION = BitTag.mask_of(Tag.PREPOSITION.value)
+
+PREPOSITION_CASES = [(BitTag.mask_of({case}), f"takes_{name}") for case, name in CASES.items()]
 
 
 @define
 class Word(Hashable):
-    word: str = field()
+    """A single interpretation of a word form.
+
+    Forms of a vocabulary come in the hundreds of thousands, so instances are kept
+    small: strings are interned, equal tags and lemmas share one object, and the
+    hash is computed once.
+    """
+
+    word: str = field(converter=sys.intern)
     lemma: Lemma = field()
     tags: Set[str] = field(kw_only=True, converter=tags_from_str)
     # raw_tag: str = field(kw_only=True)
-    data1: Set[str] = field(kw_only=True, default=set(), repr=False)
-    data2: Set[str] = field(kw_only=True, default=set(), repr=False)
+    data1: frozenset[str] = field(kw_only=True, default=frozenset(), converter=qualifiers, repr=False, eq=False)
+    data2: frozenset[str] = field(kw_only=True, default=frozenset(), converter=qualifiers, repr=False, eq=False)
+    mask: int = field(init=False, repr=False, eq=False)
+    _hash: int = field(init=False, repr=False, eq=False)
+
+    def __attrs_post_init__(self) -> None:
+        self.mask = tags_mask(self.tags)
+        self._hash = hash((self.word, self.lemma, self.tags))
 
     def __hash__(self) -> int:
-        return hash(f"{self.word}|{self.lemma.to_str()}|{self.tags}")
+        return self._hash
+
+    # String hashes differ between processes, so the hash is recomputed on unpickling.
+    def __getstate__(self) -> dict[str, Any]:
+        return {"word": self.word, "lemma": self.lemma, "tags": self.tags, "data1": self.data1, "data2": self.data2}
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        for name, value in state.items():
+            object.__setattr__(self, name, value)  # skip the converters, the values are parsed already
+        self.__attrs_post_init__()
 
     def is_adj(self) -> bool:
-        return bool(self.tags >= Tag.ADJECTIVE)
+        return self.mask & ADJECTIVE == ADJECTIVE
 
     def is_adv(self) -> bool:
-        return bool(self.tags >= Tag.ADVERB)
+        return self.mask & ADVERB == ADVERB
 
     def is_noun(self) -> bool:
-        return bool(self.tags >= Tag.NOUN)
+        return self.mask & NOUN == NOUN
 
     def is_verb(self) -> bool:
-        return bool(self.tags >= Tag.INFINITIVE)
+        return self.mask & INFINITIVE == INFINITIVE
 
     def is_pron(self) -> bool:
-        return bool(self.tags >= Tag.PPRON12) or bool(self.tags >= Tag.PPRON3)
+        return self.mask & PPRON12 == PPRON12 or self.mask & PPRON3 == PPRON3
 
     is_pronoun = is_pron
 
     def is_preposition(self) -> bool:
-        return bool(self.tags >= Tag.PREPOSITION)
+        return self.mask & PREPOSITION == PREPOSITION
 
     is_prep = is_preposition
 
@@ -86,46 +153,84 @@ class Analysis:
     word: str = field()
 
 
-class WordList(Set[Word]):
-    sequence: list[int]
-    container: dict[int, Word]
+class WordList(MutableSet[Word]):
+    """An insertion-ordered set of words.
+
+    Interpretations are compared by form, lemma and tags only, so the same
+    interpretation coming from several dictionaries is kept once, as first seen.
+    """
+
+    _words: dict[Word, None]
 
-    def __init__(self) -> None:
+    def __init__(self, words: Iterable[Word] = ()) -> None:
         super().__init__()
-        self.current = None
-        self.sequence = []
-        self.container = {}
+        self._words = dict.fromkeys(words)
 
     def __contains__(self, x: object) -> bool:
-        return False
+        return x in self._words
 
     def __iter__(self) -> Iterator[Word]:
-        return list(self.container.values()).__iter__()
+        return iter(self._words)
 
     def __len__(self) -> int:
-        return self.container.__len__()
+        return len(self._words)
 
     def add(self, value: Word) -> None:
-        h = hash(value)
-        if h not in self.container:
-            self.container[h] = value
-        if h not in self.sequence:
-            self.sequence.append(h)
+        self._words.setdefault(value)
 
     def discard(self, value: Word) -> None:
-        h = hash(value)
-        if h in self.container:
-            self.container.pop(h)
-            self.sequence.remove(h)
+        self._words.pop(value, None)
 
     def __repr__(self) -> str:
-        return "\n\t".join(map(repr, self.container.values()))
+        return "\n\t".join(map(repr, self._words))
+
+
+type Data = tuple[str, str, str, list[str], list[str]]
+type Interp = tuple[int, int, Data] | tuple[Data, ...]
+type CacheKey = tuple[str, Literal["analyse", "generate"], str, str | None, MorfeuszOptions]
+
+
+def _decode_interps(value: str) -> tuple[Interp, ...]:
+    def to_interp(item: list[object]) -> Interp:
+        match item:
+            case [int(start), int(end), [*data]]:
+                return (start, end, tuple(data))  # type: ignore[return-value]
+            case [*path]:
+                return tuple(tuple(data) for data in path)  # type: ignore[return-value]
+
+    return tuple(map(to_interp, json.loads(value)))
+
+
+ANALYSE_MANY_SEPARATOR = "|"
+
+type PartOfSpeech = Literal["adj", "noun", "pronoun", "verb", "prep"]
+
+PARTS_OF_SPEECH: Mapping[PartOfSpeech, Callable[[Word], bool]] = {
+    "adj": Word.is_adj,
+    "noun": Word.is_noun,
+    "pronoun": Word.is_pron,
+    "verb": Word.is_verb,
+    "prep": Word.is_preposition,
+}
 
 
 @define
 class Morf:
     dict_names: list[str] = field()
+    dict_ids: list[str]
     morfeuszes: list[Morfeusz]
+    options: MorfeuszOptions
+    cache: LRUCache[CacheKey, tuple[Interp, ...]]
+    store: DiskCache[tuple[Interp, ...]] | None
+    lemmas: LRUCache[str, Mapping[PartOfSpeech, tuple[Word, ...]]]
+    paradigms: LRUCache[str, Set[Word]]
+    # `lock` guards the caches of this Morf, `locks` the (shared) Morfeusz instances;
+    # when both are needed `lock` is taken first.
+    locks: dict[str, RLock]
+    lock: RLock
+    # Morfeusz calls by operation, and the size of every paradigm generated for a decliner.
+    calls: Counter[str]
+    forms_per_lemma: dict[PartOfSpeech, Histogram]
 
     def __init__(
             self,
@@ -141,155 +246,262 @@ class Morf:
             praet: str | None = None,
             separate_numbering: bool = True,
             case_handling: Literal[100, 101, 102] = 100,
-            whitespace: Literal[301, 302, 303] = 301
+            whitespace: Literal[301, 302, 303] = 301,
+            cache_size: int = 4096,
+            cache_path: str | Path | None = None,
         ):
 
-        self.morfeuszes = []
         self.dict_names = [dict_names] if isinstance(dict_names, str) else list(dict_names)
-        _dict_path: str | None = "/usr/share/morfeusz2/dictionaries"
-
-        for dict_name in self.dict_names:
-            self.morfeuszes.append(Morfeusz(
-                aggl=aggl,
-                analyse=analyse,
-                case_handling=case_handling,
-                dict_name=dict_name,
-                dict_path=_dict_path,
-                expand_dag=expand_dag,
-                expand_dot=expand_dot,
-                expand_tags=expand_tags,
-                expand_underscore=expand_underscore,
-                generate=generate,
-                praet=praet,
-                separate_numbering=separate_numbering,
-                whitespace=whitespace,
-            ))
+        self.options = (
+            ("aggl", aggl),
+            ("analyse", analyse),
+            ("case_handling", case_handling),
+            ("expand_dag", expand_dag),
+            ("expand_dot", expand_dot),
+            ("expand_tags", expand_tags),
+            ("expand_underscore", expand_underscore),
+            ("generate", generate),
+            ("praet", praet),
+            ("separate_numbering", separate_numbering),
+            ("whitespace", whitespace),
+        )
+        self.cache = LRUCache(maxsize=cache_size)
+        self.lemmas = LRUCache(maxsize=cache_size)
+        self.paradigms = LRUCache(maxsize=cache_size)
+        self.store = None if cache_path is None else DiskCache(cache_path, decode=_decode_interps)
+        entries = [REGISTRY.entry(dict_name, self.options, dict_path=DICT_PATH) for dict_name in self.dict_names]
+        self.morfeuszes = [entry.morfeusz for entry in entries]
+        self.dict_ids = [entry.dict_id for entry in entries]
+        self.locks = {entry.dict_id: entry.lock for entry in entries}
+        self.lock = RLock()
+        self.calls = Counter()
+        self.forms_per_lemma = {pos: Histogram() for pos in PARTS_OF_SPEECH}
+
+    def _lookup(self, key: CacheKey, compute: Callable[[], tuple[Interp, ...]]) -> tuple[Interp, ...]:
+        store = self.store
+        with self.lock:
+            if store is None:
+                return self.cache.get_or_compute(key, compute)
+            return self.cache.get_or_compute(key, lambda: store.get_or_compute(key, compute))
+
+    def _cached(self, key: CacheKey) -> tuple[Interp, ...] | None:
+        with self.lock:
+            value = self.cache.get(key)
+            if value is None and self.store is not None:
+                value = self.store.get(key)
+                if value is not None:
+                    self.cache.put(key, value)
+            return value
+
+    def _remember(self, key: CacheKey, value: tuple[Interp, ...]) -> None:
+        with self.lock:
+            self.cache.put(key, value)
+            if self.store is not None:
+                self.store.put(key, value)
+
+    def _locked[T](self, dict_id: str, operation: str, call: Callable[[], T]) -> T:
+        with self.locks[dict_id]:
+            self.calls[operation] += 1
+            return call()
+
+    def _analyse(self, dict_id: str, m: Morfeusz, string: str) -> tuple[Interp, ...]:
+        return self._lookup(
+            (dict_id, "analyse", string, None, self.options),
+            lambda: self._locked(dict_id, "analyse", lambda: tuple(m.analyse(string))),
+        )
+
+    def _generate(self, dict_id: str, m: Morfeusz, lemma: str, tag_id: str | None) -> tuple[Interp, ...]:
+        return self._lookup(
+            (dict_id, "generate", lemma, tag_id, self.options),
+            lambda: self._locked(dict_id, "generate", lambda: tuple((thing,) for thing in m.generate(lemma, tag_id))),
+        )
+
+    @staticmethod
+    def _split_batch(interps: list[tuple[int, int, Data]], size: int) -> list[list[tuple[int, int, Data]]] | None:
+        """Split a DAG analysis of ``size`` separator-joined terms back into per-term DAGs.
+
+        Node numbers are rebased so that every term's DAG starts at node 0, exactly as if
+        it had been analysed on its own. Returns ``None`` when the separators cannot be
+        told apart from the terms.
+        """
+        separators = sorted({(start, end) for (start, end, data) in interps if data[0] == ANALYSE_MANY_SEPARATOR})
+        if len(separators) != size - 1:
+            return None
+
+        offsets = [0, *(end for _, end in separators)]
+        parts: list[list[tuple[int, int, Data]]] = [[] for _ in range(size)]
+        for (start, end, data) in interps:
+            if data[0] == ANALYSE_MANY_SEPARATOR:
+                continue
+            i = bisect_right(offsets, start) - 1
+            parts[i].append((start - offsets[i], end - offsets[i], data))
+
+        return parts
+
+    def _analyse_many(self, dict_id: str, m: Morfeusz, strings: list[str], batch_size: int) -> dict[str, tuple[Interp, ...]]:
+        with self.lock, self.locks[dict_id]:
+            results: dict[str, tuple[Interp, ...]] = {}
+            missing: list[str] = []
+
+            for string in dict.fromkeys(strings):
+                value = self._cached((dict_id, "analyse", string, None, self.options))
+                if value is None:
+                    missing.append(string)
+                else:
+                    results[string] = value
+
+            for i in range(0, len(missing), batch_size):
+                batch = missing[i:i + batch_size]
+
+                expand_dag = m.expand_dag
+                m.expand_dag = False
+                try:
+                    self.calls["analyse_many"] += 1
+                    dag = m.analyse(f" {ANALYSE_MANY_SEPARATOR} ".join(batch))
+                finally:
+                    m.expand_dag = expand_dag
+
+                parts = self._split_batch(list(dag), len(batch))
+                if parts is None:
+                    self.calls["analyse"] += len(batch)
+                    parts = [list(m.analyse(string)) for string in batch]
+                elif expand_dag:
+                    parts = [Morfeusz._dag_to_list(part) for part in parts]  # type: ignore[attr-defined]
+
+                for string, part in zip(batch, parts, strict=True):
+                    value = tuple(part)
+                    self._remember((dict_id, "analyse", string, None, self.options), value)
+                    results[string] = value
+
+            return results
+
+    def close(self) -> None:
+        if self.store is not None:
+            self.store.close()
+
+    def metrics(self) -> dict[str, Any]:
+        """Morfeusz calls, cache hit ratios and paradigm sizes, ready for ``json.dump``."""
+        caches: dict[str, LRUCache[Any, Any] | DiskCache[Any]] = {"memory": self.cache, "lemmas": self.lemmas, "paradigms": self.paradigms}
+        if self.store is not None:
+            caches["disk"] = self.store
+
+        with self.lock:
+            return {
+                "calls": dict(self.calls),
+                "caches": {
+                    name: {"hits": c.hits, "misses": c.misses, "hit_ratio": c.hits / (c.hits + c.misses) if c.hits + c.misses else 0.0}
+                    for name, c in caches.items()
+                },
+                "forms_per_lemma": {pos: histogram.to_json() for pos, histogram in self.forms_per_lemma.items() if histogram.count},
+            }
+
+    @staticmethod
+    def _add_analyses(words: WordList, interps: Iterable[Interp]) -> None:
+        for datum in interps:
+            match datum:
+                case [_, _, (word, lemma, tag, data1, data2)] | [(word, lemma, tag, data1, data2)]:
+                    w = Word(
+                        word=word,
+                        lemma=Lemma.from_str(lemma),
+                        tags=tag,
+                        data1=data1,
+                        data2=data2,
+                    )
+                    words.add(w)
 
     def analyze(self: Self, string: str) -> Set[Word]:
         words = WordList()
 
-        for m in self.morfeuszes:
-            for datum in m.analyse(string):
+        for dict_id, m in zip(self.dict_ids, self.morfeuszes, strict=True):
+            self._add_analyses(words, self._analyse(dict_id, m, string))
+
+        return words
+
+    def analyze_many(self: Self, strings: Iterable[str], batch_size: int = 256) -> list[Set[Word]]:
+        """Analyse many strings with as few Morfeusz calls as possible.
+
+        Uncached strings are joined into batches of ``batch_size`` and analysed in a single
+        call per batch; the DAG node offsets are used to split the interpretations back
+        per string. The result is aligned with the input.
+        """
+        strings = list(strings)
+        results = [WordList() for _ in strings]
+
+        for dict_id, m in zip(self.dict_ids, self.morfeuszes, strict=True):
+            analyses = self._analyse_many(dict_id, m, strings, batch_size)
+            for words, string in zip(results, strings, strict=True):
+                self._add_analyses(words, analyses[string])
+
+        return list[Set[Word]](results)
+
+    def generate(self: Self, lemma: str, tag_id: str | None = None) -> Set[Word]:
+
+        words = WordList()
+        for dict_id, m in zip(self.dict_ids, self.morfeuszes, strict=True):
+            for datum in self._generate(dict_id, m, lemma, tag_id):
                 match datum:
-                    case [_, _, (word, lemma, tag, data1, data2)] | [(word, lemma, tag, data1, data2)]:
+                    case [_, _, (word, lemma_str, tag, _, _)] | [(word, lemma_str, tag, _, _)]:
                         w = Word(
                             word=word,
-                            lemma=Lemma.from_str(lemma),
                             tags=tag,
-                            data1=set(data1),
-                            data2=set(data2),
+                            lemma=Lemma.from_str(lemma_str),
+                            # raw_tag=thing[2],
                         )
-
-                        if w not in words:
-                            words.add(w)
+                        words.add(w)
 
         return words
 
-    def generate(self: Self, lemma: str, tag_id: str | None = None) -> Set[Word]:
+    def lemma_candidates(self, surface: str) -> Mapping[PartOfSpeech, tuple[Word, ...]]:
+        """The interpretations of ``surface`` that are lemmas of themselves, by part of speech.
+
+        The index is shared by all the decliners, so declining one term as several parts
+        of speech analyses it only once.
+        """
+        def index() -> Mapping[PartOfSpeech, tuple[Word, ...]]:
+            lemmas = [w for w in self.analyze(surface) if w.lemma.to_str() == surface]
+            return {pos: tuple(filter(is_pos, lemmas)) for pos, is_pos in PARTS_OF_SPEECH.items()}
+
+        with self.lock:
+            return self.lemmas.get_or_compute(surface, index)
+
+    def paradigm(self, lemma: str) -> Set[Word]:
+        """Every form of ``lemma``.
+
+        A lemma ambiguous between parts of speech is declined by several decliners,
+        so the generated paradigm is kept and shared by all of them. It must not be
+        modified.
+        """
+        with self.lock:
+            return self.paradigms.get_or_compute(lemma, lambda: self.generate(lemma))
+
+    def _paradigm(self, word: Word, pos: PartOfSpeech) -> Set[Word]:
+        forms = self.paradigm(word.lemma.to_str())
+        with self.lock:
+            self.forms_per_lemma[pos].add(len(forms))
+        return forms
 
-        words = WordList()
-        for m in self.morfeuszes:
-            result = m.generate(lemma, tag_id)
-            for thing in result:
-                w = Word(
-                    word=thing[0],
-                    tags=thing[2],
-                    lemma=Lemma.from_str(thing[1]),
-                    # raw_tag=thing[2],
-                )
-                if w not in words:
-                    words.add(w)
-                    # words.append(w)
+    def _resolve(self, word: str | Word, pos: PartOfSpeech) -> Word | None:
+        if isinstance(word, Word):
+            return word
 
-        return words
+        candidates = self.lemma_candidates(word)[pos]
+        return candidates[-1] if candidates else None
 
     class NotANounError(Exception):
         """Raised when the word is not a noun"""
 
     def decline_adjective(self, adj: str | Word):
-        def reducer(acc: Word | None, cur: Word):
-            if cur.lemma.to_str() == (adj if isinstance(adj, str) else adj.word):
-                return cur
-            return acc
-
-        if isinstance(adj, str):
-            word = reduce(
-                reducer,
-                list(self.analyze(adj)),
-                Word(word=adj, lemma=Lemma(word=adj, tags=""), tags="", data1=set(), data2=set())
-            )
-        else:
-            word = reducer(adj, adj)
+        word = self._resolve(adj, "adj")
 
         if word is None or not word.is_adj():
             return None
 
         forms = FormyPrzymiotników.empty(lambda: FormyPrzypadków.empty(lambda: ""))
 
-        s = word.lemma.to_str()
-        generated = self.generate(s)
-        for form in generated:
-            numbers = Tag.Number & form.tags
-            genders = Tag.Gender & form.tags
-            obj: FormyPrzypadków
-            # obj = forms.liczba_mnoga if number == Tag.PLURAL else forms.liczba_pojedyncza
-            for number in numbers:
-                for gender in genders:
-                    a = forms.liczba_mnoga if number == Tag.PLURAL else forms.liczba_pojedyncza
-                    if isinstance(a, GenderedSingular):
-                        match gender:
-                            case "m1":
-                                obj = a.m1
-                            case "m2":
-                                obj = a.m2
-                            case "m3":
-                                obj = a.m3
-                            case "f":
-                                obj = a.f
-                            case "n":
-                                obj = a.n
-                            case _:
-                                continue
-                    else:
-                        match gender:
-                            case "m1":
-                                obj = a.m1
-                            case "reszta":
-                                obj = a.reszta
-                            case _:
-                                continue
-
-                    if form.tags >= Tag.NOMINATIVE:
-                        obj.mianownik = form.word
-                    if form.tags >= Tag.GENITIVE:
-                        obj.dopełniacz = form.word
-                    if form.tags >= Tag.DATIVE:
-                        obj.celownik = form.word
-                    if form.tags >= Tag.ACCUSATIVE:
-                        obj.biernik = form.word
-                    if form.tags >= Tag.LOCATIVE:
-                        obj.miejscownik = form.word
-                    if form.tags >= Tag.INSTRUMENTAL:
-                        obj.narzędnik = form.word
-                    if form.tags >= Tag.VOCATIVE:
-                        obj.wołacz = form.word
-
-        return forms
+        return fill_all(forms, "adj", ((form.word, form.tags) for form in self._paradigm(word, "adj")))
 
     def decline_pronoun(self, pron: str | Word):
-        def reducer(acc: Word | None, cur: Word):
-            if cur.lemma.to_str() == (pron if isinstance(pron, str) else pron.word):
-                return cur
-            return acc
-
-        if isinstance(pron, str):
-            word = reduce(
-                reducer,
-                list(self.analyze(pron)),
-                Word(word=pron, lemma=Lemma(word=pron, tags=""), tags="", data1=set(), data2=set())
-            )
-        else:
-            word = reducer(pron, pron)
+        word = self._resolve(pron, "pronoun")
 
         if word is None or not word.is_pron():
             return None
@@ -299,60 +511,12 @@ class Morf:
             empty_lp=lambda: GenderedSingular[FormyPrzypadków[str]].empty(lambda: FormyPrzypadków.empty(lambda: "")),
         )
 
-        s = word.lemma.to_str()
-        generated = self.generate(s)
-        for form in generated:
-            numbers = Tag.Number & form.tags
-            genders = Tag.Gender & form.tags
-            obj: FormyPrzypadków
-            # obj = forms.liczba_mnoga if number == Tag.PLURAL else forms.liczba_pojedyncza
-            for number in numbers:
-                for gender in genders:
-                    a = forms.liczba_mnoga if number in Tag.PLURAL.value else forms.liczba_pojedyncza
-                    match gender:
-                        case "m1":
-                            obj = a.m1
-                        case "m2":
-                            obj = a.m2
-                        case "m3":
-                            obj = a.m3
-                        case "f":
-                            obj = a.f
-                        case "n":
-                            obj = a.n
-                        case _:
-                            continue
-
-                    if form.tags >= Tag.NOMINATIVE:
-                        obj.mianownik = form.word
-                    if form.tags >= Tag.GENITIVE:
-                        obj.dopełniacz = form.word
-                    if form.tags >= Tag.DATIVE:
-                        obj.celownik = form.word
-                    if form.tags >= Tag.ACCUSATIVE:
-                        obj.biernik = form.word
-                    if form.tags >= Tag.LOCATIVE:
-                        obj.miejscownik = form.word
-                    if form.tags >= Tag.INSTRUMENTAL:
-                        obj.narzędnik = form.word
-                    if form.tags >= Tag.VOCATIVE:
-                        obj.wołacz = form.word
-
-        return forms
+        # Of the variants of a form (jego, niego, go, ń) the most general one is written last.
+        generated = sorted(self._paradigm(word, "pronoun"), key=lambda form: pronoun_preference(form.tags))
+        return fill_all(forms, "pronoun", ((form.word, form.tags) for form in generated))
 
     def decline_noun(self, noun: str | Word):
-        def reducer(acc: Word | None, cur: Word):
-            cmp: str = noun if isinstance(noun, str) else noun.word
-            return cur if cur.lemma.to_str() == cmp else acc
-
-        if isinstance(noun, str):
-            word = reduce(
-                reducer,
-                list(self.analyze(noun)),
-                Word(word=noun, lemma=Lemma(word=noun, tags=""), tags="", data1=set(), data2=set())
-            )
-        else:
-            word = reducer(noun, noun)
+        word = self._resolve(noun, "noun")
 
         if word is None or not word.is_noun():
             return None
@@ -360,43 +524,12 @@ class Morf:
         forms = FormyRzeczowników.empty(lambda: "")
         forms.rodzaj = Tag(word.tags & Tag.Gender)
 
-        s = word.lemma.to_str()
-        generated = self.generate(s)
-        for form in generated:
-            number = Tag.Number & form.tags
-            obj = forms.liczba_mnoga if number == Tag.PLURAL else forms.liczba_pojedyncza
-
-            if form.tags >= Tag.NOMINATIVE:
-                obj.mianownik = form.word
-            if form.tags >= Tag.GENITIVE:
-                obj.dopełniacz = form.word
-            if form.tags >= Tag.DATIVE:
-                obj.celownik = form.word
-            if form.tags >= Tag.ACCUSATIVE:
-                obj.biernik = form.word
-            if form.tags >= Tag.LOCATIVE:
-                obj.miejscownik = form.word
-            if form.tags >= Tag.INSTRUMENTAL:
-                obj.narzędnik = form.word
-            if form.tags >= Tag.VOCATIVE:
-                obj.wołacz = form.word
+        fill_all(forms, "noun", ((form.word, form.tags) for form in self._paradigm(word, "noun")))
 
         return forms if (not forms.liczba_mnoga.is_empty() and not forms.liczba_pojedyncza.is_empty()) else None
 
     def conjugate_verb(self, verb: str | Word):
-        def reducer(acc: Word | None, cur: Word):
-            if cur.lemma.to_str() == (verb if isinstance(verb, str) else verb.word):
-                return cur
-            return acc
-
-        if isinstance(verb, str):
-            word = reduce(
-                reducer,
-                list(self.analyze(verb)),
-                Word(word=verb, lemma=Lemma(word=verb, tags=""), tags="", data1=set(), data2=set())
-            )
-        else:
-            word = reducer(verb, verb)
+        word = self._resolve(verb, "verb")
 
         if word is None or not word.is_verb():
             return None
@@ -405,55 +538,10 @@ class Morf:
 
         forms = FormyCzasowników(aspekt=aspekt)
 
-        s = word.lemma.to_str()
-        generated = self.generate(s)
-
-        for form in generated:
-            if form.tags >= Tag.INFINITIVE:
-                forms.bezokolicznik = form.word
-                continue
-
-            if form.tags >= Tag.FINITIVE:
-                if form.tags >= Tag.SINGULAR:
-                    if form.tags >= Tag.FIRST:
-                        forms._czas_teraźniejszy.liczba_pojedyncza.pierwsza_osoba = form.word  # type: ignore[assignment]
-                    elif form.tags >= Tag.SECOND:
-                        forms._czas_teraźniejszy.liczba_pojedyncza.druga_osoba = form.word  # type: ignore[assignment]
-                    elif form.tags >= Tag.THIRD:
-                        forms._czas_teraźniejszy.liczba_pojedyncza.trzecia_osoba = form.word  # type: ignore[assignment]
-                elif form.tags >= Tag.PLURAL:
-                    if form.tags >= Tag.FIRST:
-                        forms._czas_teraźniejszy.liczba_mnoga.pierwsza_osoba = form.word  # type: ignore[assignment]
-                    elif form.tags >= Tag.SECOND:
-                        forms._czas_teraźniejszy.liczba_mnoga.druga_osoba = form.word  # type: ignore[assignment]
-                    elif form.tags >= Tag.THIRD:
-                        forms._czas_teraźniejszy.liczba_mnoga.trzecia_osoba = form.word  # type: ignore[assignment]
-
-            elif form.tags >= Tag.PARTICIPLE_L:
-                if form.tags >= Tag.SINGULAR:
-                    for t in form.tags & Tag.Gender:
-                        setattr(forms.rdzeń_czasu_przeszłego.liczba_pojedyncza, t, form.word)
-                elif form.tags >= Tag.PLURAL:
-                    if form.tags & Tag.MASCULINE_HUMAN:
-                        forms.rdzeń_czasu_przeszłego.liczba_mnoga.m1 = form.word
-                    else:
-                        forms.rdzeń_czasu_przeszłego.liczba_mnoga.reszta = form.word
-
-        return forms
+        return fill_all(forms, "verb", ((form.word, form.tags) for form in self._paradigm(word, "verb")))
 
     def get_preposition_supported_cases(self, prep: str | Word):
-        def reducer(acc: Word | None, cur: Word):
-            cmp: str = prep if isinstance(prep, str) else prep.word
-            return cur if cur.lemma.to_str() == cmp else acc
-
-        if isinstance(prep, str):
-            word = reduce(
-                reducer,
-                list(self.analyze(prep)),
-                Word(word=prep, lemma=Lemma(word=prep, tags=""), tags="", data1=set(), data2=set())
-            )
-        else:
-            word = reducer(prep, prep)
+        word = self._resolve(prep, "prep")
 
         if word is None or not word.is_preposition():
             return None
@@ -470,25 +558,12 @@ class Morf:
             takes_extra="",
         ))
 
-        s = word.lemma.to_str()
-        generated = self.generate(s)
-        for form in generated:
-            if not (form.tags & Tag.PREPOSITION):
+        for form in self._paradigm(word, "prep"):
+            if not form.mask & PREPOSITION:
                 continue
 
-            if form.tags >= Tag.NOMINATIVE:
-                forms.takes_mianownik = True
-            if form.tags >= Tag.GENITIVE:
-                forms.takes_dopełniacz = True
-            if form.tags >= Tag.DATIVE:
-                forms.takes_celownik = True
-            if form.tags >= Tag.ACCUSATIVE:
-                forms.takes_biernik = True
-            if form.tags >= Tag.LOCATIVE:
-                forms.takes_miejscownik = True
-            if form.tags >= Tag.INSTRUMENTAL:
-                forms.takes_narzędnik = True
-            if form.tags >= Tag.VOCATIVE:
-                forms.takes_wołacz = True
+            for bit, name in PREPOSITION_CASES:
+                if form.mask & bit:
+                    setattr(forms, name, True)
 
         return forms
@@ -1,4 +1,8 @@
+from collections.abc import Iterable, Iterator, Sequence
+from itertools import batched
 from pathlib import Path
+from time import perf_counter
+import argparse
 from typing import Literal, NotRequired, TypedDict, cast
 
 import anki
@@ -6,16 +10,24 @@ import anki.collection
 import anki.decks
 import anki.errors
 import anki.hooks
+import anki.lang
 import anki.models
 import anki.notes
+from anki.utils import checksum, split_fields, strip_html_media
 
 from attr import asdict
-from attrs import define
+from attrs import Factory, define
 from pydantic import ConfigDict, TypeAdapter, with_config
 from rich import print  # noqa: A004
 
 from duo_scrapo.templates import AnkiTemplate, dedent
-from duo_scrapo.export import export, export_czasowniki, export_rzeczowniki
+from duo_scrapo.apkg import ApkgIndex, ApkgWriter
+from duo_scrapo.cache import DEFAULT_CACHE_PATH
+from duo_scrapo.checkpoint import Checkpoint, CheckpointState, resume_export
+from duo_scrapo.exclude import load_exclusions
+from duo_scrapo.export import FORM_TYPES, export_czasowniki, export_rzeczowniki
+from duo_scrapo.Morf import Morf
+from duo_scrapo.pipeline import ExportPipeline
 import duo_scrapo.słowa.przymiotniki
 import duo_scrapo.słowa.przysłówki
 import duo_scrapo.słowa.rzeczowniki
@@ -30,7 +42,7 @@ from duo_scrapo.słowa.przyimki import FormyPrzyimków
 from duo_scrapo.słowa.zaimki import FormyZaimków
 from duo_scrapo.słowa.czasowniki import FormyCzasowników
 
-from duo_scrapo.słowa.słownictwo import load_vocabulary
+from duo_scrapo.słowa.słownictwo import TermDefinition, load_vocabulary
 import genanki
 import genanki.card
 import genanki.deck
@@ -136,34 +148,84 @@ def from_model(obj: Model) -> anki.models.NotetypeDict:
     return cast(anki.models.NotetypeDict, obj)
 
 
-def add_fields_to_note_type(col: anki.collection.Collection, note_type: Model, fields: tuple[str, ...]) -> Model:
-    model = col.models.by_name(note_type["name"])
-    model = note_type if model is None else to_model(model)
+def new_note(col: anki.collection.Collection, note_type: Model, note: dict[str, str]) -> anki.notes.Note:
+    new_note = col.new_note(notetype=from_model(note_type))
+    for field_name, field_value in note.items():
+        new_note[field_name] = field_value
+
+    return new_note
 
-    for field_name in fields:
-        field = col.models.new_field(field_name)
-        col.models.add_field(from_model(model), field)
 
-    return model
+def note_from_row(row: Sequence[str]) -> dict[str, str]:
+    """Pola notatki z wiersza punktu kontrolnego: typu form, ``en``, ``pl`` i samych form."""
+    (type_name, en, pl, *forms) = row
+    return dict(pl=pl, en=en, **dict(zip(FORM_TYPES[type_name].get_cols(), forms, strict=True)))
 
 
-def add_template(col: anki.collection.Collection, note_type: Model, tpl: AnkiTemplate) -> Model:
-    for existing_template in note_type['tmpls']:
-        if existing_template['name'] == tpl.name:
-            for k, a in asdict(tpl).items():
-                existing_template[k] = a
+@define
+class NoteTypeChanges:
+    created: bool = False
+    fields: list[str] = Factory(list)
+    added_templates: list[str] = Factory(list)
+    updated_templates: list[str] = Factory(list)
+    removed_templates: list[str] = Factory(list)
 
-            return note_type
+    def __bool__(self) -> bool:
+        return self.created or any((self.fields, self.added_templates, self.updated_templates, self.removed_templates))
 
-    new_tpl = col.models.new_template(tpl.name)
-    template = to_template(new_tpl)
 
-    for k, a in asdict(tpl).items():
-        template[k] = a
+def reconcile_note_type(
+    col: anki.collection.Collection,
+    name: str,
+    fields: Sequence[str],
+    templates: Sequence[AnkiTemplate],
+    *,
+    prune_templates: bool = False,
+) -> tuple[Model, NoteTypeChanges]:
+    """Doprowadza typ notatki do zadanych pól i szablonów najmniejszą liczbą zmian.
 
-    note_type['tmpls'].append(template)
+    Brakujące pola i szablony są dodawane, a szablony o innej treści poprawiane. Zbędne
+    szablony znikają tylko z ``prune_templates``, a pola nigdy, bo zabrałyby ze sobą dane
+    notatek. Gdy nic się nie różni, typ notatki nie jest zapisywany, więc nie zmienia się
+    schemat kolekcji i nie trzeba pełnej synchronizacji.
+    """
+    notetype = col.models.by_name(name)
+    changes = NoteTypeChanges(created=notetype is None)
+    if notetype is None:
+        notetype = col.models.new(name)
 
-    return note_type
+    existing_fields = set(col.models.field_names(notetype))
+    for field_name in fields:
+        if field_name not in existing_fields:
+            col.models.add_field(notetype, col.models.new_field(field_name))
+            changes.fields.append(field_name)
+
+    stale = {template["name"]: template for template in notetype["tmpls"]}
+    for tpl in templates:
+        wanted = asdict(tpl)
+        template = stale.pop(tpl.name, None)
+        if template is None:
+            template = col.models.new_template(tpl.name)
+            template.update(wanted)  # type: ignore[typeddict-item]
+            col.models.add_template(notetype, template)
+            changes.added_templates.append(tpl.name)
+        elif any(template.get(k) != v for k, v in wanted.items()):
+            template.update(wanted)  # type: ignore[typeddict-item]
+            changes.updated_templates.append(tpl.name)
+
+    if prune_templates:
+        for template in stale.values():
+            col.models.remove_template(notetype, template)
+            changes.removed_templates.append(template["name"])
+
+    if changes.created:
+        notetype = col.models.get(col.models.add_dict(notetype).id)
+    elif changes:
+        col.models.update_dict(notetype)
+
+    if changes:
+        print(f"Typ notatki {name}: {changes}")
+    return (to_model(notetype), changes)
 
 
 def add_note_to_collection(col: anki.collection.Collection, note_type: Model, note: dict[str, str]) -> anki.notes.Note:
@@ -176,55 +238,157 @@ def add_note_to_collection(col: anki.collection.Collection, note_type: Model, no
     note_type (anki.models.NoteType): The NoteType to which the notes will be added.
     notes (Iterable[anki.notes.Note]): An iterable of notes to add to the Collection.
     """
-    new_note = col.new_note(notetype=from_model(note_type))
-    for field_name, field_value in note.items():
-        new_note[field_name] = field_value
+    added = new_note(col, note_type, note)
 
     # deck_id = col.default_deck_for_notetype(anki.models.NotetypeId(note_type["id"]))
     deck_id = anki.decks.DeckId(DECK_ID)
     try:
-        col.update_note(new_note)
+        col.update_note(added)
     except anki.errors.NotFoundError:
-        col.add_note(new_note, deck_id=deck_id)  # , deck_id=anki.decks.DeckId(0))
-
-    return new_note
-
-
-def add_czasowniki_to_collection(col: anki.collection.Collection, collection_name: Literal["czasowniki"] = "czasowniki"):
-    # Sprawdź, czy typ notatki "Czasowniki" już istnieje
-    czasowniki = col.models.by_name(collection_name.capitalize())
+        col.add_note(added, deck_id=deck_id)  # , deck_id=anki.decks.DeckId(0))
 
-    if czasowniki is None:
-        # Utwórz nowy typ notatki
-        czasowniki = col.models.new("Czasowniki")
+    return added
 
-    czasowniki = to_model(czasowniki)
-    czasowniki["id"] = duo_scrapo.słowa.czasowniki.MODEL_ID_CZASOWNIKI
 
-    # Dodaj pola do typu notatki
-    # add_fields_to_note_type(col, new_note_type, ("Front", "Back", "pl", "en"))
-    add_fields_to_note_type(col, czasowniki, ("pl", "en"))
-    add_fields_to_note_type(col, czasowniki, FormyCzasowników.get_cols())
-
-    seen: list[str] = []
-    # Dodaj szablon do typu notatki
-    for tpl in duo_scrapo.słowa.czasowniki.templates:
-        add_template(col, czasowniki, tpl)
-        seen.append(tpl.qfmt)
-
-    # if czasowniki["id"]:
-    col.models.update_dict(from_model(czasowniki))
-    # else:
-    # col.models.add_dict(from_model(czasowniki))
-    # try:
-    #     # Dodaj nowy typ notatki do kolekcji
-    #     col.models.add(from_model(czasowniki))
-    # except anki.errors.CardTypeError:
-    #     print(dict(enumerate(duo_scrapo.templates.czasowniki.templates)))
-    #     raise
+def add_notes_to_collection(col: anki.collection.Collection, note_type: Model, notes: Iterable[dict[str, str]]) -> int:
+    """Dodaje wszystkie notatki jednym wywołaniem ``add_notes``, czyli w jednej transakcji."""
+    start = perf_counter()
+    deck_id = anki.decks.DeckId(DECK_ID)
+    requests = [anki.collection.AddNoteRequest(new_note(col, note_type, note), deck_id=deck_id) for note in notes]
+    if requests:
+        col.add_notes(requests)
+
+    elapsed = perf_counter() - start
+    print(f"Dodano {len(requests)} notatek w {elapsed:.2f} s ({len(requests) / elapsed:.0f} notatek/s)")
+    return len(requests)
+
+
+def first_field_checksum(text: str) -> int:
+    """Suma kontrolna pierwszego pola, liczona tak jak ``notes.csum`` w Anki."""
+    # ``strip_html_media`` korzysta z ``anki.lang``, które poza aplikacją Anki nie jest zainicjowane
+    if anki.lang.current_i18n is None:
+        anki.lang.set_lang(anki.lang.current_lang)
+    return int(checksum(strip_html_media(text))[:8], 16)
+
+
+def existing_notes(
+    col: anki.collection.Collection,
+    note_type: Model,
+    first_values: Iterable[str],
+    matched: set[int],
+) -> dict[str, list[tuple[int, list[str]]]]:
+    """Niedopasowane jeszcze notatki typu ``note_type`` o pierwszym polu z ``first_values``,
+    pogrupowane po tym polu, w kolejności dodania."""
+    checksums = {first_field_checksum(value) for value in first_values}
+    placeholders = ", ".join("?" for _ in checksums)
+    existing: dict[str, list[tuple[int, list[str]]]] = {}
+    for note_id, flds in col.db.execute(f"select id, flds from notes where mid = ? and csum in ({placeholders}) order by id", note_type["id"], *checksums):  # noqa: S608
+        if note_id in matched:
+            continue
+        fields = split_fields(flds)
+        existing.setdefault(fields[0], []).append((note_id, fields))
+    return existing
+
+
+@define
+class SyncResult:
+    added: int = 0
+    updated: int = 0
+    unchanged: int = 0
+
+
+def sync_notes_to_collection(
+    col: anki.collection.Collection,
+    note_type: Model,
+    notes: Iterable[dict[str, str]],
+    batch_size: int = 500,
+) -> SyncResult:
+    """Dodaje tylko nowe notatki i aktualizuje tylko te, których wygenerowane pola się zmieniły.
+
+    Istniejące notatki szukamy po pierwszym polu (``pl``): Anki trzyma jego sumę kontrolną
+    w indeksowanej kolumnie ``notes.csum``, więc wystarczy jedno zapytanie na partię.
+    Porównujemy tylko pola, które generujemy; pozostałe pola notatki zostają bez zmian.
+    """
+    start = perf_counter()
+    current = col.models.get(anki.models.NotetypeId(note_type["id"]))
+    names = col.models.field_names(current or from_model(note_type))
+    index = {name: i for i, name in enumerate(names)}
+    first = names[0]
+
+    result = SyncResult()
+    new: list[dict[str, str]] = []
+    changed: list[anki.notes.Note] = []
+    # Notatki z tym samym ``pl`` dopasowujemy po kolei, w kolejności dodania; każdą tylko raz.
+    matched: set[int] = set()
+    for chunk in batched(notes, batch_size):
+        existing = existing_notes(col, note_type, (note[first] for note in chunk), matched)
+        for note in chunk:
+            matches = existing.get(note[first])
+            if not matches:
+                new.append(note)
+                continue
+
+            (note_id, fields) = matches.pop(0)
+            matched.add(note_id)
+            if all(fields[index[name]] == value for name, value in note.items()):
+                result.unchanged += 1
+                continue
+
+            updated = col.get_note(anki.notes.NoteId(note_id))
+            for name, value in note.items():
+                updated[name] = value
+            changed.append(updated)
+
+    if changed:
+        col.update_notes(changed)
+        result.updated = len(changed)
+    if new:
+        result.added = add_notes_to_collection(col, note_type, new)
+
+    print(f"Synchronizacja w {perf_counter() - start:.2f} s: nowe {result.added}, zmienione {result.updated}, bez zmian {result.unchanged}")
+    return result
+
+
+CZASOWNIKI_CHECKPOINT = Path(".cache/czasowniki.checkpoint")
+
+
+def add_czasowniki_to_collection(
+    col: anki.collection.Collection,
+    collection_name: Literal["czasowniki"] = "czasowniki",
+    *,
+    resume: bool = False,
+    bulk: bool = False,
+    sync: bool = False,
+):
+    # Utwórz typ notatki "Czasowniki" albo uzupełnij w nim tylko to, czego brakuje
+    (czasowniki, _) = reconcile_note_type(
+        col,
+        collection_name.capitalize(),
+        ("pl", "en", *FormyCzasowników.get_cols()),
+        duo_scrapo.słowa.czasowniki.templates,
+    )
 
     vocab = load_vocabulary()
-    for (word, forms) in export_czasowniki(vocab):
+
+    def exporter(rest: Sequence[TermDefinition], state: CheckpointState) -> Iterator[tuple[TermDefinition, FormyCzasowników]]:
+        return export_czasowniki(rest, seen=state.seen)
+
+    if bulk or sync:
+        # Notatki trafiają do kolekcji dopiero na końcu, więc bierzemy je wszystkie z wierszy
+        # punktu kontrolnego, także te sprzed wznowienia.
+        checkpoint = Checkpoint(CZASOWNIKI_CHECKPOINT)
+        for _ in resume_export(vocab, exporter, checkpoint, resume=resume):
+            pass
+        notes = map(note_from_row, checkpoint.rows())
+        if sync:
+            sync_notes_to_collection(col, czasowniki, notes)
+        else:
+            add_notes_to_collection(col, czasowniki, notes)
+        return
+
+    # Notatka trafia do kolekcji od razu, więc punkt kontrolny zapisujemy po każdej.
+    checkpoint = Checkpoint(CZASOWNIKI_CHECKPOINT, every=1)
+    for (word, forms) in resume_export(vocab, exporter, checkpoint, resume=resume):
         # Utwórz nową notatkę
         add_note_to_collection(col, czasowniki, dict(
             pl=word.term,
@@ -233,33 +397,32 @@ def add_czasowniki_to_collection(col: anki.collection.Collection, collection_nam
         ))
 
 
-def add_rzeczowniki_to_collection(col: anki.collection.Collection, collection_name: Literal["rzeczowniki"]):
-    # Sprawdź, czy typ notatki "Rzeczowniki" już istnieje
-    rzeczowniki = col.models.by_name(collection_name.capitalize())
-
-    if rzeczowniki is None:
-        # Utwórz nowy typ notatki
-        rzeczowniki = col.models.new("Rzeczowniki")
-
-    rzeczowniki = to_model(rzeczowniki)
-    rzeczowniki["id"] = duo_scrapo.słowa.rzeczowniki.MODEL_ID_RZECZOWNIKI
-
-    # Dodaj pola do typu notatki
-    add_fields_to_note_type(col, rzeczowniki, ("pl", "en"))
-    add_fields_to_note_type(col, rzeczowniki, FormyRzeczowników.get_cols())
-
-    rzeczowniki["tmpls"].clear()
-    # Dodaj szablon do typu notatki
-    for tpl in duo_scrapo.słowa.rzeczowniki.templates:
-        add_template(col, rzeczowniki, tpl)
-
-    if rzeczowniki["id"]:
-        col.models.update_dict(from_model(rzeczowniki))
-    else:
-        # Dodaj nowy typ notatki do kolekcji
-        col.models.add_dict(from_model(rzeczowniki))
+def add_rzeczowniki_to_collection(
+    col: anki.collection.Collection,
+    collection_name: Literal["rzeczowniki"],
+    *,
+    bulk: bool = False,
+    sync: bool = False,
+):
+    # Utwórz typ notatki "Rzeczowniki" albo uzupełnij w nim tylko to, czego brakuje;
+    # szablony spoza ``templates`` są usuwane, jak wcześniej przy czyszczeniu ``tmpls``
+    (rzeczowniki, _) = reconcile_note_type(
+        col,
+        collection_name.capitalize(),
+        ("pl", "en", *FormyRzeczowników.get_cols()),
+        duo_scrapo.słowa.rzeczowniki.templates,
+        prune_templates=True,
+    )
 
     vocab = load_vocabulary()
+    if bulk or sync:
+        notes = (dict(pl=word.term, en=word.definition, **forms.as_dict()) for word, forms in export_rzeczowniki(vocab))
+        if sync:
+            sync_notes_to_collection(col, rzeczowniki, notes)
+        else:
+            add_notes_to_collection(col, rzeczowniki, notes)
+        return
+
     for (word, forms) in export_rzeczowniki(vocab):
         # Utwórz nową notatkę
         add_note_to_collection(col, rzeczowniki, dict(
@@ -269,7 +432,7 @@ def add_rzeczowniki_to_collection(col: anki.collection.Collection, collection_na
         ))
 
 
-def zmain():
+def zmain(*, resume: bool = False):
     # Ścieżka do pliku kolekcji Anki
     # filepath = Path.cwd() / "dev/collection.anki2"
     # filepath = Path.cwd() / "rzyns/collection.anki2"
@@ -296,7 +459,7 @@ def zmain():
         )
 
     start_count = _get_counts()
-    add_czasowniki_to_collection(col)
+    add_czasowniki_to_collection(col, resume=resume, sync=True)
     # col.close()
 
     # col = anki.collection.Collection(filepath.as_posix())
@@ -314,34 +477,55 @@ def zmain():
         print("Notatka została dodana do kolekcji Anki.")
 
 
-def main():
+def main(*, delta: bool = False):
+    """Eksportuje talię do ``deck.apkg``, a z ``delta`` do ``deck-delta.apkg`` tylko notatki nowe lub zmienione od poprzedniego eksportu."""
     deck = genanki.Deck(anki.decks.DeckId(DECK_ID), name="DuoScrapo")
 
     vocab = load_vocabulary()
-    for (word, forms, _) in export(vocab):
-        fields = (word.definition, word.term, *forms.to_rows())
-
-        match forms:
-            case FormyCzasowników():
-                model = duo_scrapo.słowa.czasowniki.model
-            case FormyRzeczowników():
-                model = duo_scrapo.słowa.rzeczowniki.model
-            case FormyZaimków():
-                model = duo_scrapo.słowa.zaimki.model
-            case FormyPrzymiotników():
-                model = duo_scrapo.słowa.przymiotniki.model
-            case FormyPrzysłówków():
-                model = duo_scrapo.słowa.przysłówki.model
-            case FormyPrzyimków():
-                model = duo_scrapo.słowa.przyimki.model
-
-        deck.add_note(genanki.note.Note(
-            model=model,
-            fields=list(fields),
-        ))
-
-    genanki.Package(deck).write_to_file("deck.apkg")
+    morf = Morf(cache_path=DEFAULT_CACHE_PATH)
+    pipeline = ExportPipeline(vocab, morf, vocab_count=len(vocab), exclude=load_exclusions())
+    try:
+        with ApkgIndex() as index:
+            # Notatki idą do pliku od razu, więc pamięć nie rośnie z wielkością talii
+            with ApkgWriter(Path("deck-delta.apkg" if delta else "deck.apkg"), deck) as writer:
+                for (_, forms, fields, _) in pipeline:
+                    match forms:
+                        case FormyCzasowników():
+                            model = duo_scrapo.słowa.czasowniki.model
+                        case FormyRzeczowników():
+                            model = duo_scrapo.słowa.rzeczowniki.model
+                        case FormyZaimków():
+                            model = duo_scrapo.słowa.zaimki.model
+                        case FormyPrzymiotników():
+                            model = duo_scrapo.słowa.przymiotniki.model
+                        case FormyPrzysłówków():
+                            model = duo_scrapo.słowa.przysłówki.model
+                        case FormyPrzyimków():
+                            model = duo_scrapo.słowa.przyimki.model
+
+                    note = genanki.note.Note(
+                        model=model,
+                        fields=list(fields),
+                    )
+                    # Każda notatka dostaje GUID, pod którym już ją eksportowaliśmy
+                    if index.stamp(note) or not delta:
+                        writer.add(note)
+
+            # Zapamiętujemy notatki dopiero, gdy paczka jest już zapisana
+            index.commit()
+    finally:
+        morf.close()
+
+    print(f"Maksymalne zapełnienie kolejek eksportu: {pipeline.high_water}")
+    print(f"Zapisano {writer.notes} notatek do {writer.path} (nowe: {index.new}, zmienione: {index.changed}, bez zmian: {index.unchanged})")
+
+
+def run(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="ank", description="Eksportuje słownictwo do talii Anki.")
+    parser.add_argument("--delta", action="store_true", help="zapisz do deck-delta.apkg tylko notatki nowe lub zmienione od poprzedniego eksportu")
+    args = parser.parse_args(argv)
+    main(delta=args.delta)
 
 
 if __name__ == "__main__":
-    main()
+    run()
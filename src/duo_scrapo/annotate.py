@@ -4,10 +4,9 @@ from typing import Literal, Protocol
 
 from attrs import define, field
 import cattrs
-from pydantic import BaseModel, Field
-from pydantic_settings import BaseSettings, PydanticBaseSettingsSource, SettingsConfigDict, TomlConfigSettingsSource
 
 from duo_scrapo.Morf import Morf, Word
+from duo_scrapo.settings import Settings
 from duo_scrapo.słowa.słownictwo import TermDefinition
 
 type Data = tuple[str, str, str, list[str], list[str]]
@@ -86,27 +85,6 @@ data = cattrs.structure(json.loads(Path("results.json").read_bytes()), list[Term
 m = Morf(dict_names=["sgjp"])
 
 
-class Filter(BaseModel):
-    exclude: list[str] = []
-
-
-class Settings(BaseSettings):
-    filter: Filter = Field(default=Filter())
-
-    model_config = SettingsConfigDict(toml_file='config.toml')
-
-    @classmethod
-    def settings_customise_sources(
-        cls,
-        settings_cls: type[BaseSettings],
-        init_settings: PydanticBaseSettingsSource,
-        env_settings: PydanticBaseSettingsSource,
-        dotenv_settings: PydanticBaseSettingsSource,
-        file_secret_settings: PydanticBaseSettingsSource
-    ) -> tuple[PydanticBaseSettingsSource, ...]:
-        return (TomlConfigSettingsSource(settings_cls),)
-
-
 config = Settings()
 
 
@@ -0,0 +1,175 @@
+"""Streaming .apkg writer, and an index of exported notes for delta packages."""
+
+from collections.abc import Iterator, Sequence
+from hashlib import sha256
+from pathlib import Path
+from types import TracebackType
+from typing import Self
+import itertools
+import json
+import os
+import sqlite3
+import tempfile
+import time
+import zipfile
+
+from attrs import define, field
+import genanki
+from genanki.apkg_col import APKG_COL
+from genanki.apkg_schema import APKG_SCHEMA
+
+from duo_scrapo.cache import DiskCache
+
+
+DEFAULT_INDEX_PATH = Path(".cache/apkg-index.sqlite")
+
+# The field holding the citation form of the lemma, per part of speech. A term can
+# have several lemmas of one part of speech ("mam": mieć and mamić), so ``en`` and
+# ``pl`` alone do not tell their notes apart.
+LEMMA_FIELDS = ("bezokolicznik", "lp_mianownik", "lp_m1_mianownik", "preposition", "form")
+
+
+@define
+class ApkgWriter:
+    """Writes every note into the package database as it is added, instead of holding the deck.
+
+    With the same timestamp the package holds the rows ``genanki.Package`` would write.
+    """
+
+    path: Path = field(converter=Path)
+    deck: genanki.Deck
+    timestamp: float = field(factory=time.time, kw_only=True)
+    # Notes between commits of the package database.
+    commit_every: int = field(default=1000, kw_only=True)
+    notes: int = field(default=0, init=False)
+    models: dict[int, genanki.Model] = field(init=False)
+    _dbfile: Path = field(init=False, repr=False)
+    _conn: sqlite3.Connection = field(init=False, repr=False)
+    _cursor: sqlite3.Cursor = field(init=False, repr=False)
+    _ids: Iterator[int] = field(init=False, repr=False)
+
+    def __attrs_post_init__(self) -> None:
+        self.models = dict(self.deck.models)
+        (fd, name) = tempfile.mkstemp(suffix=".anki2", dir=self.path.parent)
+        os.close(fd)
+        self._dbfile = Path(name)
+        self._conn = sqlite3.connect(self._dbfile)
+        self._cursor = self._conn.cursor()
+        self._cursor.executescript(APKG_SCHEMA)
+        self._cursor.executescript(APKG_COL)
+        self._ids = itertools.count(int(self.timestamp * 1000))
+
+    def add(self, note: genanki.Note) -> None:
+        self.models.setdefault(note.model.model_id, note.model)
+        note.write_to_db(self._cursor, self.timestamp, self.deck.deck_id, self._ids)
+        self.notes += 1
+        if self.notes % self.commit_every == 0:
+            self._conn.commit()
+
+    def close(self) -> None:
+        """Fill in the deck and its models and write the package."""
+        try:
+            (decks,) = self._cursor.execute("SELECT decks FROM col").fetchone()
+            self._cursor.execute("UPDATE col SET decks = ?", (json.dumps({**json.loads(decks), str(self.deck.deck_id): self.deck.to_json()}),))
+            (models,) = self._cursor.execute("SELECT models FROM col").fetchone()
+            models = {**json.loads(models), **{model.model_id: model.to_json(self.timestamp, self.deck.deck_id) for model in self.models.values()}}
+            self._cursor.execute("UPDATE col SET models = ?", (json.dumps(models),))
+            self._conn.commit()
+            self._conn.close()
+
+            # The package replaces the previous one only once it is complete.
+            (fd, name) = tempfile.mkstemp(suffix=".apkg", dir=self.path.parent)
+            os.close(fd)
+            try:
+                with zipfile.ZipFile(name, "w", compression=zipfile.ZIP_DEFLATED) as package:
+                    package.write(self._dbfile, "collection.anki2")
+                    package.writestr("media", json.dumps({}))
+                os.replace(name, self.path)
+            except BaseException:
+                Path(name).unlink(missing_ok=True)
+                raise
+        finally:
+            self.discard()
+
+    def discard(self) -> None:
+        self._conn.close()
+        self._dbfile.unlink(missing_ok=True)
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, exc_type: type[BaseException] | None, exc: BaseException | None, tb: TracebackType | None) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.discard()
+
+
+def fields_hash(fields: Sequence[str]) -> str:
+    return sha256("\x1f".join(fields).encode()).hexdigest()[:16]
+
+
+@define
+class ApkgIndex:
+    """GUIDs and field hashes of exported notes; ``new``, ``changed`` and ``unchanged`` count what ``stamp`` saw.
+
+    A changed note keeps the GUID it was first exported under, so importing a delta
+    package updates it in place; genanki's GUID hashes all the fields and would make
+    it a second note.
+    """
+
+    path: Path = field(default=DEFAULT_INDEX_PATH, converter=Path)
+    new: int = field(default=0, init=False)
+    changed: int = field(default=0, init=False)
+    unchanged: int = field(default=0, init=False)
+    _store: DiskCache[list[str]] = field(init=False, repr=False)
+    # Stored by ``commit``, once the package they went into is written.
+    _pending: dict[str, list[str]] = field(factory=dict, init=False, repr=False)
+    # Keys of the notes stamped since the last ``commit``, changed or not.
+    _stamped: set[str] = field(factory=set, init=False, repr=False)
+
+    def __attrs_post_init__(self) -> None:
+        self._store = DiskCache[list[str]](self.path)
+
+    def key(self, note: genanki.Note) -> str:
+        names = [field["name"] for field in note.model.fields]
+        lemma = next((note.fields[names.index(name)] for name in LEMMA_FIELDS if name in names), "")
+        return genanki.guid_for(note.model.model_id, *note.fields[:2], lemma)
+
+    def stamp(self, note: genanki.Note) -> bool:
+        """Give ``note`` the GUID it was exported under before; true if it is new or changed since."""
+        key = self.key(note)
+        if key in self._stamped:
+            # Another note of this export already has the key: this one is known only by
+            # all of its fields and keeps genanki's GUID, as if there were no index.
+            key = genanki.guid_for(note.model.model_id, *note.fields)
+        self._stamped.add(key)
+        digest = fields_hash(note.fields)
+        stored = self._store.get(key)
+        if stored is None:
+            self.new += 1
+        else:
+            (note.guid, exported) = stored
+            if exported == digest:
+                self.unchanged += 1
+                return False
+            self.changed += 1
+
+        self._pending[key] = [note.guid, digest]
+        return True
+
+    def commit(self) -> None:
+        for key, entry in self._pending.items():
+            self._store.put(key, entry)
+        self._store.flush()
+        self._pending.clear()
+        self._stamped.clear()
+
+    def close(self) -> None:
+        self._store.close()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, exc_type: type[BaseException] | None, exc: BaseException | None, tb: TracebackType | None) -> None:
+        self.close()
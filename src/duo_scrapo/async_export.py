@@ -0,0 +1,108 @@
+"""Export for asyncio programs: the vocabulary is analysed and inflected in an
+executor, a batch at a time."""
+
+import asyncio
+from collections.abc import AsyncIterable, AsyncIterator, Iterable, Sequence
+from concurrent.futures import Executor
+from itertools import batched
+from typing import Any
+
+from duo_scrapo.Morf import Morf, Word
+from duo_scrapo.export import Classified, Seen, SomeForm, SomeType, Stats, classify, export_classified, inflect
+from duo_scrapo.słowa.słownictwo import TermDefinition
+
+
+type Inflected = dict[tuple[SomeType, Word], SomeForm | None]
+type Batch = tuple[list[tuple[TermDefinition, Classified]], Inflected]
+
+
+async def abatched(data: AsyncIterable[TermDefinition] | Iterable[TermDefinition], n: int) -> AsyncIterator[Sequence[TermDefinition]]:
+    if not isinstance(data, AsyncIterable):
+        for batch in batched(data, n):
+            yield batch
+        return
+
+    chunk: list[TermDefinition] = []
+    async for vocab_word in data:
+        chunk.append(vocab_word)
+        if len(chunk) == n:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def inflect_batch(m: Morf, chunk: Sequence[TermDefinition], seen: Seen) -> Batch:
+    """Analyse ``chunk`` and inflect every interpretation whose lemma may still need exporting.
+
+    ``seen`` is only read, and it only grows, so whatever is skipped here is skipped
+    again when the batch is replayed.
+    """
+    analyses = m.analyze_many([vocab_word.term for vocab_word in chunk], len(chunk))
+    terms = [(vocab_word, classify(analysis)) for vocab_word, analysis in zip(chunk, analyses, strict=True)]
+
+    inflected: Inflected = {}
+    done: set[tuple[SomeType, str]] = set()
+    for _, classified in terms:
+        for thing, kinds in classified:
+            for kind in kinds:
+                key = (kind, thing.lemma.word)
+                if key in done or key in seen or (kind, thing) in inflected:
+                    continue
+                forms = inflected[kind, thing] = inflect(m, kind, thing)
+                if forms is not None:
+                    done.add(key)
+
+    return (terms, inflected)
+
+
+async def export_async(
+    data: AsyncIterable[TermDefinition] | Iterable[TermDefinition],
+    morf: Morf | None = None,
+    *,
+    concurrency: int = 4,
+    batch_size: int = 64,
+    executor: Executor | None = None,
+    stats: Stats | None = None,
+) -> AsyncIterator[tuple[TermDefinition, SomeForm]]:
+    """Export ``data`` on ``executor`` (the loop's default one if not given).
+
+    Which term a lemma is exported for is decided on the loop, in the order the
+    batches complete; with ``concurrency=1`` the output is what ``export`` produces.
+    """
+    loop = asyncio.get_running_loop()
+    m = morf or Morf()
+    seen = Seen()
+    stats = stats or Stats(vocab_count=0)
+
+    batches = aiter(abatched(data, batch_size))
+    next_chunk: asyncio.Future[Sequence[TermDefinition] | None] | None = asyncio.ensure_future(anext(batches, None))
+    pending: set[asyncio.Future[Batch]] = set()
+
+    try:
+        while next_chunk is not None or pending:
+            waiting: set[asyncio.Future[Any]] = set(pending)
+            if next_chunk is not None and len(pending) < concurrency:
+                waiting.add(next_chunk)
+
+            done, _ = await asyncio.wait(waiting, return_when=asyncio.FIRST_COMPLETED)
+
+            if next_chunk in done:
+                chunk = next_chunk.result()
+                if chunk is None:
+                    next_chunk = None
+                else:
+                    stats.vocab_count += len(chunk)
+                    pending.add(loop.run_in_executor(executor, inflect_batch, m, chunk, seen))
+                    next_chunk = asyncio.ensure_future(anext(batches, None))
+
+            for future in pending & done:
+                pending.discard(future)
+                terms, inflected = future.result()
+                for vocab_word, forms, _ in export_classified(terms, lambda kind, thing, inflected=inflected: inflected.get((kind, thing)), stats, seen):
+                    yield (vocab_word, forms)
+    finally:
+        if next_chunk is not None:
+            next_chunk.cancel()
+        for future in pending:
+            future.cancel()
@@ -0,0 +1,136 @@
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from pathlib import Path
+import json
+import sqlite3
+
+from attrs import define, field
+
+
+DEFAULT_CACHE_PATH = Path(".cache/morfeusz.sqlite")
+
+
+@define
+class LRUCache[K: Hashable, V]:
+    """A size-bounded mapping that evicts the least recently used entry first.
+
+    A ``maxsize`` of ``0`` disables caching, every lookup is a miss.
+    """
+
+    maxsize: int = field(default=4096)
+    hits: int = field(default=0, init=False)
+    misses: int = field(default=0, init=False)
+    evictions: int = field(default=0, init=False)
+    _data: OrderedDict[K, V] = field(factory=OrderedDict[K, V], init=False, repr=False)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._data
+
+    def get(self, key: K) -> V | None:
+        if key in self._data:
+            self.hits += 1
+            self._data.move_to_end(key)
+            return self._data[key]
+
+        self.misses += 1
+        return None
+
+    def put(self, key: K, value: V) -> None:
+        if self.maxsize <= 0:
+            return
+
+        self._data[key] = value
+        self._data.move_to_end(key)
+
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def get_or_compute(self, key: K, compute: Callable[[], V]) -> V:
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def clear(self) -> None:
+        self._data.clear()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+@define
+class DiskCache[V]:
+    """A persistent key/value store backed by SQLite.
+
+    Keys are JSON-encoded, so every key component must be JSON-serialisable.
+    Writes are committed in batches of ``commit_every``; call ``close()`` (or
+    ``flush()``) to make sure the tail end of a run is persisted.
+    """
+
+    path: Path = field(converter=Path)
+    encode: Callable[[V], str] = field(default=json.dumps, kw_only=True)
+    decode: Callable[[str], V] = field(default=json.loads, kw_only=True)
+    commit_every: int = field(default=256, kw_only=True)
+    hits: int = field(default=0, init=False)
+    misses: int = field(default=0, init=False)
+    _pending: int = field(default=0, init=False, repr=False)
+    _conn: sqlite3.Connection = field(init=False, repr=False)
+
+    def __attrs_post_init__(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Callers using a cache from several threads serialise access themselves.
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+
+    def __len__(self) -> int:
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()
+        return count
+
+    def get(self, key: Hashable) -> V | None:
+        row = self._conn.execute("SELECT value FROM entries WHERE key = ?", (json.dumps(key),)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return self.decode(row[0])
+
+    def put(self, key: Hashable, value: V) -> None:
+        self._conn.execute(
+            "INSERT OR REPLACE INTO entries (key, value) VALUES (?, ?)",
+            (json.dumps(key), self.encode(value)),
+        )
+        self._pending += 1
+        if self._pending >= self.commit_every:
+            self.flush()
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], V]) -> V:
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def flush(self) -> None:
+        self._conn.commit()
+        self._pending = 0
+
+    def clear(self) -> None:
+        self._conn.execute("DELETE FROM entries")
+        self.flush()
+
+    def close(self) -> None:
+        self.flush()
+        self._conn.close()
@@ -0,0 +1,118 @@
+"""Checkpoints of long export runs, so that an interrupted run can be resumed."""
+
+from collections.abc import Callable, Iterator, Sequence
+from contextlib import nullcontext
+from pathlib import Path
+import json
+import os
+
+from attrs import Factory, define, field
+import cattrs
+
+from duo_scrapo.export import KINDS, Seen, SomeForm, Stats
+from duo_scrapo.pipeline import Fields, pack
+from duo_scrapo.słowa.słownictwo import TermDefinition
+
+
+@define
+class CheckpointState:
+    position: int = 0
+    rows: int = 0
+    seen: Seen = field(factory=Seen)
+    stats: Stats | None = None
+
+
+def _rows_path(checkpoint: "Checkpoint") -> Path:
+    return checkpoint.path.with_suffix(".rows.jsonl")
+
+
+@define
+class Checkpoint:
+    """Where a run keeps its state and its rows; the state is saved every ``every`` rows."""
+
+    path: Path = field(converter=Path)
+    rows_path: Path = field(default=Factory(_rows_path, takes_self=True), converter=Path, kw_only=True)
+    every: int = field(default=100, kw_only=True)
+
+    def start(self) -> CheckpointState:
+        self.path.unlink(missing_ok=True)
+        self.rows_path.parent.mkdir(parents=True, exist_ok=True)
+        self.rows_path.write_bytes(b"")
+        return CheckpointState()
+
+    def load(self) -> CheckpointState:
+        """The saved state, or a fresh start if there is none; rows written after the state was saved are dropped."""
+        try:
+            state = cattrs.structure(json.loads(self.path.read_bytes()), CheckpointState)
+        except FileNotFoundError:
+            return self.start()
+
+        with self.rows_path.open("r+b") as f:
+            for _ in range(state.rows):
+                f.readline()
+            f.truncate()
+
+        return state
+
+    def save(self, state: CheckpointState) -> None:
+        tmp = self.path.with_name(f".{self.path.name}.tmp")
+        with tmp.open("w", encoding="utf-8") as f:
+            json.dump(cattrs.unstructure(state), f, ensure_ascii=False, default=sorted)
+            f.flush()
+            os.fsync(f.fileno())
+        tmp.replace(self.path)
+
+    def finish(self) -> None:
+        self.path.unlink(missing_ok=True)
+
+    def rows(self) -> Iterator[tuple[str, ...]]:
+        with self.rows_path.open(encoding="utf-8") as f:
+            for line in f:
+                yield tuple(json.loads(line))
+
+
+def resume_export[T: tuple[TermDefinition, SomeForm, *tuple[object, ...]]](
+    data: Sequence[TermDefinition],
+    exporter: Callable[[Sequence[TermDefinition], CheckpointState], Iterator[T]],
+    checkpoint: Checkpoint,
+    *,
+    resume: bool = False,
+) -> Iterator[T]:
+    """Run ``exporter`` on what is left of ``data``, recording every row it produces in ``checkpoint``.
+
+    ``exporter`` gets the remaining terms and the state to carry on from, and must
+    yield the terms it exports in order, as the very objects found in ``data``.
+    """
+    state = checkpoint.load() if resume else checkpoint.start()
+    since_save = 0
+
+    with checkpoint.rows_path.open("a", encoding="utf-8") as rows:
+
+        def save() -> None:
+            rows.flush()
+            os.fsync(rows.fileno())
+            checkpoint.save(state)
+
+        try:
+            for item in exporter(data[state.position:], state):
+                (vocab_word, forms, *_) = item
+                while data[state.position] is not vocab_word:
+                    state.position += 1
+
+                with nullcontext() if state.stats is None else state.stats.timer("pack", KINDS[type(forms)]):
+                    fields: Fields = (type(forms).__name__, *pack(vocab_word, forms))
+                rows.write(json.dumps(fields, ensure_ascii=False) + "\n")
+                state.rows += 1
+
+                yield item
+
+                since_save += 1
+                if since_save >= checkpoint.every:
+                    save()
+                    since_save = 0
+        except GeneratorExit:
+            # The consumer stopped after handling the last item, so the state is complete.
+            save()
+            raise
+
+    checkpoint.finish()
@@ -0,0 +1,93 @@
+from collections.abc import Iterator, Sequence
+from pathlib import Path
+from typing import Literal
+import argparse
+from rich import print  # noqa: A004
+
+from duo_scrapo.Morf import Morf
+from duo_scrapo.cache import DEFAULT_CACHE_PATH
+from duo_scrapo.checkpoint import Checkpoint, CheckpointState, resume_export
+from duo_scrapo.exclude import load_exclusions
+from duo_scrapo.export import SomeForm, Stats
+from duo_scrapo.manifest import ExportManifest, export_incremental
+from duo_scrapo.shard import Shard, export_shard, merge_shards, read_shard, shard_path, write_shard
+from duo_scrapo.table import ResultTables
+from duo_scrapo.słowa.słownictwo import TermDefinition, load_vocabulary
+
+
+def run(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="export", description="Inflect the vocabulary into tables of forms.")
+    parser.add_argument("--format", choices=("jsonl", "tsv", "sqlite"), default="jsonl", help="output format (default: %(default)s)")
+    parser.add_argument("--output", type=Path, help="output file, or directory of a TSV file per part of speech (default: export.FORMAT)")
+    parser.add_argument("--resume", action="store_true", help="continue from the last checkpoint of an interrupted run")
+    parser.add_argument("--checkpoint-every", type=int, default=100, metavar="ROWS", help="rows between checkpoints (default: %(default)s)")
+    parser.add_argument("--stats", type=Path, default=Path("export-stats.json"), help="where to dump the run's stats as JSON (default: %(default)s)")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--shard", type=Shard.parse, metavar="I/N", help="export only shard I of N into a shard file (default: export.shard-I-of-N.jsonl)")
+    mode.add_argument("--merge", type=Path, nargs="+", metavar="SHARD", help="merge shard files into the output instead of exporting")
+    args = parser.parse_args(argv)
+    if args.resume and (args.shard or args.merge):
+        parser.error("--resume cannot be combined with --shard or --merge")
+    output_format: Literal["jsonl", "tsv", "sqlite"] = args.format
+    output: Path = args.output or Path("export" if output_format == "tsv" else f"export.{output_format}")
+
+    def write(tables: ResultTables) -> None:
+        match output_format:
+            case "jsonl":
+                tables.to_jsonl(output)
+            case "tsv":
+                tables.to_tsv(output)
+            case "sqlite":
+                tables.to_sqlite(output)
+
+    if args.merge:
+        tables = ResultTables()
+        tables.extend_rows(merge_shards(map(read_shard, args.merge)))
+        write(tables)
+        print(f"Merged {len(args.merge)} shards: {len(tables)} rows")
+        return
+
+    data = load_vocabulary()
+    m = Morf(dict_names=["sgjp"], cache_path=DEFAULT_CACHE_PATH)
+    exclude = load_exclusions()
+
+    if args.shard:
+        stats = Stats(vocab_count=len(data))
+        try:
+            count = write_shard(args.output or shard_path(args.shard), export_shard(data, args.shard, m, stats, exclude))
+        finally:
+            m.close()
+        stats.dump(args.stats, m)
+        print(f"Shard {args.shard}: {count} rows")
+        print(str(stats))
+        return
+
+    manifest = ExportManifest(m.dict_ids, exclude=exclude.digest)
+    checkpoint = Checkpoint(Path(".cache/export.checkpoint"), every=args.checkpoint_every)
+
+    def exporter(rest: Sequence[TermDefinition], state: CheckpointState) -> Iterator[tuple[TermDefinition, SomeForm, Stats]]:
+        state.stats = state.stats or Stats(vocab_count=len(data))
+        return export_incremental(rest, m, manifest, seen=state.seen, stats=state.stats, exclude=exclude)
+
+    stats: Stats | None = None
+    try:
+        for _, __, stats_ in resume_export(data, exporter, checkpoint, resume=args.resume):
+            stats = stats_
+    finally:
+        m.close()
+        manifest.close()
+
+    if stats is not None:
+        stats.dump(args.stats, m)
+
+    tables = ResultTables()
+    tables.extend_rows(checkpoint.rows())
+    write(tables)
+
+    print(f"Manifest: {manifest.hits} reused, {manifest.misses} inflected")
+    if stats is not None:
+        print(str(stats))
+
+
+if __name__ == "__main__":
+    run()
@@ -17,9 +17,7 @@ def do_classification():
 
     seen: list[str] = []
     roots: list[tuple[Word, TermDefinition]] = []
-    for datum in data:
-        analysis = m.analyze(datum.term)
-
+    for datum, analysis in zip(data, m.analyze_many(datum.term for datum in data), strict=True):
         for item in analysis:
             if item.lemma.word not in seen:
                 roots.append((item, datum))
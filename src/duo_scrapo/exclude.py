@@ -0,0 +1,73 @@
+"""The exclusion list: lemmas never exported."""
+
+from collections.abc import Iterable
+from fnmatch import translate
+from hashlib import sha256
+import re
+
+from attrs import define, field
+
+from duo_scrapo.Morf import Lemma, Word, WordList
+from duo_scrapo.settings import Settings
+
+
+WILDCARDS = re.compile(r"[*?\[]")
+
+
+def _compile(patterns: Iterable[str]) -> re.Pattern[str] | None:
+    patterns = list(patterns)
+    return re.compile("|".join(f"(?:{translate(pattern)})" for pattern in patterns)) if patterns else None
+
+
+@define
+class Exclusions:
+    """Lemmas as Morfeusz spells them, from ``[filter] exclude`` in ``config.toml``.
+
+    ``word:qualifier`` is a single homonym (``i:C``), a bare word every lemma of that
+    spelling; ``*`` and ``?`` are wildcards (``*:I``). A bare entry also drops the
+    vocabulary terms spelled like it before they are analysed.
+    """
+
+    patterns: tuple[str, ...] = field(converter=tuple)
+    _lemmas: frozenset[str] = field(init=False, repr=False)
+    _words: frozenset[str] = field(init=False, repr=False)
+    _lemma_wildcards: re.Pattern[str] | None = field(init=False, repr=False)
+    _word_wildcards: re.Pattern[str] | None = field(init=False, repr=False)
+    _decisions: dict[Lemma, bool] = field(factory=dict, init=False, repr=False)
+
+    def __attrs_post_init__(self) -> None:
+        qualified = [pattern for pattern in self.patterns if ":" in pattern]
+        bare = [pattern for pattern in self.patterns if ":" not in pattern]
+        self._lemmas = frozenset(pattern for pattern in qualified if not WILDCARDS.search(pattern))
+        self._words = frozenset(pattern for pattern in bare if not WILDCARDS.search(pattern))
+        self._lemma_wildcards = _compile(pattern for pattern in qualified if WILDCARDS.search(pattern))
+        self._word_wildcards = _compile(pattern for pattern in bare if WILDCARDS.search(pattern))
+
+    def __bool__(self) -> bool:
+        return bool(self.patterns)
+
+    @property
+    def digest(self) -> str:
+        """Identifies the list, whatever the order or repetition of its entries."""
+        return sha256("\n".join(sorted(set(self.patterns))).encode()).hexdigest()[:16]
+
+    def excludes_term(self, term: str) -> bool:
+        return term in self._words or (self._word_wildcards is not None and self._word_wildcards.match(term) is not None)
+
+    def excludes(self, lemma: Lemma) -> bool:
+        decision = self._decisions.get(lemma)
+        if decision is None:
+            decision = self._decisions[lemma] = (
+                self.excludes_term(lemma.word)
+                or lemma.to_str() in self._lemmas
+                or (self._lemma_wildcards is not None and self._lemma_wildcards.match(lemma.to_str()) is not None)
+            )
+        return decision
+
+    def interpretations(self, analysis: Iterable[Word]) -> WordList:
+        """The interpretations in ``analysis`` of lemmas not excluded, in their order."""
+        return WordList(word for word in analysis if not self.excludes(word.lemma))
+
+
+def load_exclusions(settings: Settings | None = None) -> Exclusions:
+    return Exclusions((settings or Settings()).filter.exclude)
@@ -1,12 +1,19 @@
-from collections.abc import Generator, Iterable
+from collections.abc import Callable, Generator, Iterable, Iterator, Set
+from functools import partial
+from itertools import batched
+from contextlib import AbstractContextManager, nullcontext
+from pathlib import Path
+import json
 import textwrap
-from typing import Literal, Protocol
+from typing import Any, Literal, Protocol
 from collections.abc import Sized
 from attr import field
 from attrs import define
 from rich import print  # noqa: A004
 
-from duo_scrapo.Morf import Morf
+from duo_scrapo.Morf import Morf, Word, WordList
+from duo_scrapo.exclude import Exclusions
+from duo_scrapo.metrics import Histogram, timed
 from duo_scrapo.tag import Tag
 from duo_scrapo.słowa.przymiotniki import FormyPrzymiotników
 from duo_scrapo.słowa.przysłówki import FormyPrzysłówków
@@ -14,7 +21,7 @@ from duo_scrapo.słowa.przyimki import FormyPrzyimków
 from duo_scrapo.słowa.zaimki import FormyZaimków
 from duo_scrapo.słowa.czasowniki import FormyCzasowników
 from duo_scrapo.słowa.rzeczowniki import FormyRzeczowników
-from duo_scrapo.słowa.słownictwo import TermDefinition, load_vocabulary
+from duo_scrapo.słowa.słownictwo import TermDefinition
 
 
 type SomeType = Literal["adj", "noun", "verb", "pronoun", "preposition", "adverb"]
@@ -22,22 +29,176 @@ type SomeType = Literal["adj", "noun", "verb", "pronoun", "preposition", "adverb
 
 type SomeForm = FormyCzasowników | FormyRzeczowników | FormyPrzymiotników | FormyZaimków | FormyPrzyimków | FormyPrzysłówków
 
+FORM_TYPES: dict[str, type[SomeForm]] = {
+    cls.__name__: cls
+    for cls in (FormyCzasowników, FormyRzeczowników, FormyPrzymiotników, FormyZaimków, FormyPrzyimków, FormyPrzysłówków)
+}
+
+KINDS: dict[type[SomeForm], SomeType] = {
+    FormyCzasowników: "verb",
+    FormyRzeczowników: "noun",
+    FormyPrzymiotników: "adj",
+    FormyZaimków: "pronoun",
+    FormyPrzyimków: "preposition",
+    FormyPrzysłówków: "adverb",
+}
+
+
+@define
+class Stats:
+    """Counts of what the export produced and timings of where it spent its time.
+
+    Timings are histograms in microseconds, keyed by stage (``analyse``,
+    ``generate``, ``pack``) and, past the analysis, by part of speech, e.g.
+    ``generate.verb``.
+    """
+
+    vocab_count: int
+    processed: int = field(default=0)
+    adjectives: int = field(default=0)
+    nouns: int = field(default=0)
+    pronouns: int = field(default=0)
+    verbs: int = field(default=0)
+    prepositions: int = field(default=0)
+    adverbs: int = field(default=0)
+    excluded_terms: int = field(default=0)
+    excluded_interpretations: int = field(default=0)
+    timings: dict[str, Histogram] = field(factory=dict)
+
+    def log(self, kind: SomeType) -> None:
+        self.processed += 1
+        if kind == "adj":
+            self.adjectives += 1
+        elif kind == "noun":
+            self.nouns += 1
+        elif kind == "pronoun":
+            self.pronouns += 1
+        elif kind == "verb":
+            self.verbs += 1
+        elif kind == "preposition":
+            self.prepositions += 1
+        elif kind == "adverb":
+            self.adverbs += 1
+
+    def timer(self, stage: str, kind: SomeType | None = None) -> AbstractContextManager[None]:
+        key = stage if kind is None else f"{stage}.{kind}"
+        histogram = self.timings.get(key)
+        if histogram is None:
+            histogram = self.timings[key] = Histogram()
+        return timed(histogram)
+
+    @property
+    def unhandled(self) -> int:
+        return self.vocab_count - self.adjectives - self.nouns - self.pronouns - self.verbs - self.prepositions - self.adverbs
+
+    @property
+    def unprocessed(self) -> int:
+        return self.vocab_count - self.processed
+
+    def to_json(self, morf: Morf | None = None) -> dict[str, Any]:
+        return {
+            "vocab_count": self.vocab_count,
+            "processed": {
+                "adj": self.adjectives,
+                "noun": self.nouns,
+                "pronoun": self.pronouns,
+                "verb": self.verbs,
+                "preposition": self.prepositions,
+                "adverb": self.adverbs,
+                "total": self.processed,
+            },
+            "unhandled": self.unhandled,
+            "excluded": {"terms": self.excluded_terms, "interpretations": self.excluded_interpretations},
+            "timings_us": {key: histogram.to_json() for key, histogram in sorted(self.timings.items())},
+            **({} if morf is None else {"morfeusz": morf.metrics()}),
+        }
+
+    def dump(self, path: Path, morf: Morf | None = None) -> None:
+        path.write_text(json.dumps(self.to_json(morf), ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+
+    def __str__(self) -> str:
+        return textwrap.dedent(f"""
+            Stats:
+                Processed: {self.processed}
+                    Adjec:     {self.adjectives}
+                    Nouns:     {self.nouns}
+                    Pronouns:  {self.pronouns}
+                    Verbs:     {self.verbs}
+                    Preps:     {self.prepositions}
+                    Adverbs:   {self.adverbs}
+                    --------------------------------
+                    Total: {self.processed}
+
+                Unhandled: {self.unhandled}
+                Unprocessed: {self.unprocessed}
+                Excluded: {self.excluded_terms} terms, {self.excluded_interpretations} interpretations
+            """).lstrip()
+
+
+@define
+class Seen:
+    """The lemmas exported so far, per part of speech and regardless of it."""
+
+    by_kind: dict[SomeType, set[str]] = field(factory=dict)
+    lemmas: set[str] = field(factory=set)
+
+    def add(self, kind: SomeType, lemma: str) -> None:
+        self.by_kind.setdefault(kind, set()).add(lemma)
+        self.lemmas.add(lemma)
+
+    def __contains__(self, key: tuple[SomeType, str]) -> bool:
+        kind, lemma = key
+        return lemma in self.by_kind.get(kind, ())
+
+    def has_lemma(self, lemma: str) -> bool:
+        return lemma in self.lemmas
+
+
+def analyze_vocabulary(
+    data: Iterable[TermDefinition],
+    m: Morf,
+    batch_size: int = 256,
+    stats: Stats | None = None,
+    exclude: Exclusions | None = None,
+) -> Iterator[tuple[TermDefinition, Set[Word]]]:
+    """Analyses of ``data``, less whatever ``exclude`` excludes; an excluded term is not analysed at all."""
+    for chunk in batched(data, batch_size):
+        kept = [vocab_word for vocab_word in chunk if not exclude.excludes_term(vocab_word.term)] if exclude else chunk
+        with nullcontext() if stats is None else stats.timer("analyse"):
+            analyses = iter(m.analyze_many([vocab_word.term for vocab_word in kept], batch_size))
+
+        if not exclude:
+            yield from zip(chunk, analyses, strict=True)
+            continue
+
+        for vocab_word in chunk:
+            if exclude.excludes_term(vocab_word.term):
+                if stats is not None:
+                    stats.excluded_terms += 1
+                yield (vocab_word, WordList())
+                continue
+
+            analysis = next(analyses)
+            interpretations = exclude.interpretations(analysis)
+            if stats is not None:
+                stats.excluded_interpretations += len(analysis) - len(interpretations)
+            yield (vocab_word, interpretations)
+
 
 def export_rzeczowniki(data: Iterable[TermDefinition], morf: Morf | None = None) -> Generator[tuple[TermDefinition, FormyRzeczowników]]:
     m = morf or Morf()
 
-    seen_words: list[str] = []
+    seen = Seen()
 
-    for vocab_word in data:
-        analysis = m.analyze(vocab_word.term)
+    for vocab_word, analysis in analyze_vocabulary(data, m):
 
         for thing in analysis:
-            if thing.tags & Tag.Case and thing.lemma.word not in seen_words:
+            if thing.tags & Tag.Case and ("noun", thing.lemma.word) not in seen:
                 forms = m.decline_noun(thing)
                 if forms is None:
                     continue
 
-                seen_words.append(thing.lemma.word)
+                seen.add("noun", thing.lemma.word)
 
                 yield (vocab_word, forms)
 
@@ -68,17 +229,16 @@ def zexport_rzeczowniki(data: Iterable[TermDefinition], morf: Morf | None = None
     with open("rzeczowniki.tsv", "w", encoding="utf-8") as f:
         f.write("\t".join(columns) + "\n")
 
-        seen_words: list[str] = []
-        for vocab_word in data:
-            analysis = m.analyze(vocab_word.term)
+        seen = Seen()
+        for vocab_word, analysis in analyze_vocabulary(data, m):
 
             for thing in analysis:
-                if thing.tags & Tag.Case and thing.lemma.word not in seen_words:
+                if thing.tags & Tag.Case and ("noun", thing.lemma.word) not in seen:
                     forms = m.decline_noun(thing)
                     if forms is None:
                         continue
 
-                    seen_words.append(thing.lemma.word)
+                    seen.add("noun", thing.lemma.word)
 
                     yield (vocab_word, forms)
                     print(forms)
@@ -108,142 +268,129 @@ def export_przymiotniki():
     pass
 
 
-def export_czasowniki(data: Iterable[TermDefinition], morf: Morf | None = None) -> Generator[tuple[TermDefinition, FormyCzasowników]]:
+def export_czasowniki(
+    data: Iterable[TermDefinition],
+    morf: Morf | None = None,
+    seen: Seen | None = None,
+) -> Generator[tuple[TermDefinition, FormyCzasowników]]:
     m = morf or Morf()
 
-    seen_words: list[str] = []
-    for vocab_word in data:
-        analysis = m.analyze(vocab_word.term)
+    seen = Seen() if seen is None else seen
+    for vocab_word, analysis in analyze_vocabulary(data, m):
 
         for thing in analysis:
-            if thing.tags & Tag.Aspect and thing.lemma.word not in seen_words:
+            if thing.tags & Tag.Aspect and ("verb", thing.lemma.word) not in seen:
                 forms = m.conjugate_verb(thing)
                 if forms is None:
                     continue
 
+                # Before the yield, so that a checkpoint saved while the row is handled records the verb
+                seen.add("verb", thing.lemma.word)
+
                 yield (vocab_word, forms)
 
-                seen_words.append(thing.lemma.word)
 
+class SizedIterable[T](Sized, Iterable[T], Protocol):
+    pass
 
-@define
-class Stats:
-    vocab_count: int
-    processed: int = field(default=0)
-    adjectives: int = field(default=0)
-    nouns: int = field(default=0)
-    pronouns: int = field(default=0)
-    verbs: int = field(default=0)
 
-    def log(self, kind: SomeType) -> None:
-        self.processed += 1
-        if kind == "adj":
-            self.adjectives += 1
-        elif kind == "noun":
-            self.nouns += 1
-        elif kind == "pronoun":
-            self.pronouns += 1
-        elif kind == "verb":
-            self.verbs += 1
+type Inflector = Callable[[SomeType, Word], SomeForm | None]
 
-    @property
-    def unhandled(self) -> int:
-        return self.vocab_count - self.adjectives - self.nouns - self.verbs
 
-    @property
-    def unprocessed(self) -> int:
-        return self.vocab_count - self.processed
+def kinds_of(thing: Word) -> list[SomeType]:
+    kinds: list[SomeType] = []
+    if thing.is_adj():
+        kinds.append("adj")
+    if thing.is_verb():
+        kinds.append("verb")
+    if thing.is_noun():
+        kinds.append("noun")
+    if thing.is_pronoun():
+        kinds.append("pronoun")
+    if thing.is_preposition():
+        kinds.append("preposition")
+    if thing.is_adv():
+        kinds.append("adverb")
+    return kinds
 
-    def __str__(self) -> str:
-        return textwrap.dedent(f"""
-            Stats:
-                Processed: {self.processed}
-                    Adjec:     {self.adjectives}
-                    Nouns:     {self.nouns}
-                    Pronouns:  {self.pronouns}
-                    Verbs:     {self.verbs}
-                    --------------------------------
-                    Total: {self.processed}
 
-                Unhandled: {self.unhandled}
-                Unprocessed: {self.unprocessed}
-            """).lstrip()
+def inflect(m: Morf, kind: SomeType, thing: Word) -> SomeForm | None:
+    match kind:
+        case "adj":
+            return m.decline_adjective(thing)
+        case "verb":
+            return m.conjugate_verb(thing)
+        case "noun":
+            return m.decline_noun(thing)
+        case "pronoun":
+            return m.decline_pronoun(thing)
+        case "preposition":
+            return m.get_preposition_supported_cases(thing)
+        case "adverb":
+            return FormyPrzysłówków(form=thing.lemma.word)
 
 
-class SizedIterable[T](Sized, Iterable[T], Protocol):
-    pass
+def timed_inflector(inflector: Inflector, stats: Stats) -> Inflector:
+    """``inflector``, adding the time of every call to the ``generate`` timings of ``stats``."""
+    def timed(kind: SomeType, thing: Word) -> SomeForm | None:
+        with stats.timer("generate", kind):
+            return inflector(kind, thing)
 
+    return timed
 
-def export(data: SizedIterable[TermDefinition], morf: Morf | None = None) -> Generator[tuple[TermDefinition, SomeForm, Stats]]:
-    m = morf or Morf()
 
-    seen_words: list[tuple[SomeType, str]] = []
-    stats = Stats(vocab_count=len(data))
+type Classified = list[tuple[Word, list[SomeType]]]
 
-    for vocab_word in data:
-        analysis = m.analyze(vocab_word.term)
 
-        for thing in analysis:
-            handled = False
+def classify(analysis: Iterable[Word]) -> Classified:
+    return [(thing, kinds_of(thing)) for thing in analysis]
 
-            if thing.is_adj() and ("adj", thing.lemma.word) not in seen_words:
-                forms = m.decline_adjective(thing)
-                if forms is not None:
-                    seen_words.append(("adj", thing.lemma.word))
-                    handled = True
-                    stats.log("adj")
-                    yield (vocab_word, forms, stats)
 
-            if thing.is_verb() and ("verb", thing.lemma.word) not in seen_words:
-                forms = m.conjugate_verb(thing)
-                if forms is not None:
-                    seen_words.append(("verb", thing.lemma.word))
-                    handled = True
-                    stats.log("verb")
-                    yield (vocab_word, forms, stats)
+def export_classified(
+    classified: Iterable[tuple[TermDefinition, Classified]],
+    inflector: Inflector,
+    stats: Stats,
+    seen: Seen | None = None,
+) -> Generator[tuple[TermDefinition, SomeForm, Stats]]:
+    seen = Seen() if seen is None else seen
 
-            if thing.is_noun() and ("noun", thing.lemma.word) not in seen_words:
-                forms = m.decline_noun(thing)
-                if forms is not None:
-                    seen_words.append(("noun", thing.lemma.word))
-                    handled = True
-                    stats.log("noun")
-                    yield (vocab_word, forms, stats)
+    for vocab_word, analysis in classified:
+        for thing, kinds in analysis:
+            handled = False
 
-            if thing.is_pronoun() and ("pronoun", thing.lemma.word) not in seen_words:
-                forms = m.decline_pronoun(thing)
-                if forms is not None:
-                    seen_words.append(("pronoun", thing.lemma.word))
-                    handled = True
-                    stats.log("pronoun")
-                    yield (vocab_word, forms, stats)
+            for kind in kinds:
+                if (kind, thing.lemma.word) in seen:
+                    continue
 
-            if thing.is_preposition() and ("preposition", thing.lemma.word) not in seen_words:
-                forms = m.get_preposition_supported_cases(thing)
+                forms = inflector(kind, thing)
                 if forms is not None:
-                    seen_words.append(("preposition", thing.lemma.word))
+                    seen.add(kind, thing.lemma.word)
                     handled = True
-                    stats.log("preposition")
+                    stats.log(kind)
                     yield (vocab_word, forms, stats)
 
-            if thing.is_adv() and ("adverb", thing.lemma.word) not in seen_words:
-                forms = FormyPrzysłówków(form=thing.lemma.word)
-                seen_words.append(("adverb", thing.lemma.word))
-                handled = True
-                stats.log("adverb")
-                yield (vocab_word, forms, stats)
-
-            if not handled and thing.lemma.word not in [w for _, w in seen_words]:
+            if not handled and not seen.has_lemma(thing.lemma.word):
                 print(f"Unhandled: {vocab_word.term} => {thing.lemma} [ {thing.tags} ]")
 
 
-if __name__ == "__main__":
-    data = load_vocabulary()
-    m = Morf(dict_names=["sgjp"])
+def export_analyses(
+    analyses: Iterable[tuple[TermDefinition, Iterable[Word]]],
+    inflector: Inflector,
+    stats: Stats,
+    seen: Seen | None = None,
+) -> Generator[tuple[TermDefinition, SomeForm, Stats]]:
+    yield from export_classified(((vocab_word, classify(analysis)) for vocab_word, analysis in analyses), inflector, stats, seen)
+
 
-    stats: Stats | None = None
-    for _, __, stats_ in export(data, m):
-        stats = stats_
+def export(
+    data: SizedIterable[TermDefinition],
+    morf: Morf | None = None,
+    *,
+    seen: Seen | None = None,
+    stats: Stats | None = None,
+    exclude: Exclusions | None = None,
+) -> Generator[tuple[TermDefinition, SomeForm, Stats]]:
+    m = morf or Morf()
+    stats = stats or Stats(vocab_count=len(data))
 
-    if stats is not None:
-        print(str(stats))
+    yield from export_analyses(analyze_vocabulary(data, m, stats=stats, exclude=exclude), timed_inflector(partial(inflect, m), stats), stats, seen)
@@ -1,6 +1,7 @@
 import enum
-from typing import Any, Self, TypeIs, cast
-from collections.abc import Set
+from functools import reduce
+from typing import Any, ClassVar, Self, TypeIs, cast
+from collections.abc import Iterable, Mapping, Set
 
 
 class UnsupportedOperandTypeError(TypeError):
@@ -139,3 +140,105 @@ class Flag(frozenset[str], enum.Enum):  # noqa: PLW1641
 
     def __repr__(self) -> str:
         return f"<{self.__class__.__name__}.{self._name_}: '{self.__str__()}'>"
+
+
+class BitFlag(enum.IntFlag, boundary=enum.KEEP):
+    """An int-backed counterpart of ``Flag``.
+
+    Every tag value owns one bit and a multi-valued position such as ``m1.m2.m3``
+    is the OR of its bits, so a subset test is a single ``&``. Build one from an
+    existing ``Flag`` with ``BitFlag.of``; sets of tag values are accepted wherever
+    ``Flag`` accepts them.
+    """
+
+    _bits: ClassVar[Mapping[str, int]]
+
+    @classmethod
+    def of(cls, flag: type[Flag]) -> type["BitFlag"]:
+        values = dict.fromkeys(v for member in flag.__members__.values() for v in sorted(member.value))
+        bits = {value: 1 << i for i, value in enumerate(values)}
+
+        # Called with a name and members, an enum class creates a new enum class.
+        new = cast(type[BitFlag], cls(
+            f"Bit{flag.__name__}",
+            {name: cls._or(bits[v] for v in member.value) for name, member in flag.__members__.items()},
+            module=flag.__module__,
+        ))
+        new._set_bits(bits)
+        # EnumType installs Flag's own set operators on every class it creates.
+        for name in ("__or__", "__and__", "__xor__", "__ror__", "__rand__", "__rxor__"):
+            setattr(new, name, cls.__dict__[name])
+        return new
+
+    @classmethod
+    def _set_bits(cls, bits: Mapping[str, int]) -> None:
+        cls._bits = bits
+
+    @staticmethod
+    def _or(masks: Iterable[int]) -> int:
+        return reduce(int.__or__, masks, 0)
+
+    @classmethod
+    def mask_of(cls, values: Iterable[str]) -> int:
+        """The bits of ``values``; values this flag doesn't know have no bit and are ignored."""
+        bits = cls._bits
+        return cls._or(bits.get(v, 0) for v in values)
+
+    @classmethod
+    def from_values(cls, values: Iterable[str]) -> Self:
+        return cls(cls.mask_of(values))
+
+    def to_set(self) -> frozenset[str]:
+        return frozenset(v for v, bit in self._bits.items() if self._value_ & bit)
+
+    def _mask(self, other: object) -> int:
+        if isinstance(other, int):
+            return int(other)
+        if is_set_str(other):
+            return self.mask_of(other)
+        raise UnsupportedOperandTypeError(self.__class__.__name__, other.__class__.__name__)
+
+    def __contains__(self, other: object) -> bool:
+        mask = self._mask(other)
+        return self._value_ & mask == mask
+
+    def __eq__(self, value: object) -> bool:
+        if is_set_str(value):
+            return self._value_ == self.mask_of(value)
+        return int.__eq__(self, value)
+
+    __hash__ = int.__hash__
+
+    def __or__(self, other: object) -> Self:
+        return self.__class__(self._value_ | self._mask(other))
+
+    __ror__ = __or__
+
+    def __and__(self, other: object) -> Self:
+        return self.__class__(self._value_ & self._mask(other))
+
+    __rand__ = __and__
+
+    def __xor__(self, other: object) -> Self:
+        return self.__class__(self._value_ ^ self._mask(other))
+
+    __rxor__ = __xor__
+
+    def __sub__(self, other: object) -> Self:
+        return self.__class__(self._value_ & ~self._mask(other))
+
+    def __ge__(self, other: object) -> bool:
+        mask = self._mask(other)
+        return self._value_ & mask == mask
+
+    def __gt__(self, other: object) -> bool:
+        return self >= other and self._value_ != self._mask(other)
+
+    def __le__(self, other: object) -> bool:
+        return self._value_ & ~self._mask(other) == 0
+
+    def __lt__(self, other: object) -> bool:
+        return self <= other and self._value_ != self._mask(other)
+
+    def __str__(self) -> str:
+        return ".".join(v for v, bit in self._bits.items() if self._value_ & bit)
@@ -0,0 +1,165 @@
+"""Manifest of inflected terms, so that an incremental export only inflects new or
+changed ones."""
+
+from collections.abc import Generator, Iterator
+from functools import partial
+from hashlib import sha256
+from itertools import batched
+from pathlib import Path
+import json
+
+from attrs import define, field
+import cattrs
+
+from duo_scrapo.Morf import Lemma, Morf, Word
+from duo_scrapo.cache import DiskCache
+from duo_scrapo.exclude import Exclusions
+from duo_scrapo.export import (
+    FORM_TYPES,
+    Classified,
+    Inflector,
+    SizedIterable,
+    SomeForm,
+    Seen,
+    SomeType,
+    Stats,
+    analyze_vocabulary,
+    classify,
+    export_classified,
+    inflect,
+    timed_inflector,
+)
+from duo_scrapo.tag import Tag
+from duo_scrapo.słowa.słownictwo import TermDefinition
+
+
+DEFAULT_MANIFEST_PATH = Path(".cache/export-manifest.sqlite")
+
+# Bump whenever a change alters what the export produces for a term.
+INFLECTION_VERSION = 1
+
+converter = cattrs.Converter()
+converter.register_unstructure_hook(Tag, sorted)
+converter.register_structure_hook(Tag, lambda values, _: Tag(frozenset(values)))
+
+# [word, lemma, tags, kinds, {kind: [form type, form] | None}] per interpretation
+type Interpretation = tuple[str, str, str, list[SomeType], dict[SomeType, tuple[str, object] | None]]
+type Record = list[Interpretation]
+type Inflected = dict[tuple[SomeType, Word], SomeForm | None]
+
+
+def term_hash(vocab_word: TermDefinition) -> str:
+    return sha256(json.dumps([vocab_word.term, vocab_word.definition]).encode()).hexdigest()
+
+
+def to_record(classified: Classified, inflected: Inflected) -> Record:
+    record: Record = []
+    for thing, kinds in classified:
+        forms: dict[SomeType, tuple[str, object] | None] = {}
+        for kind in kinds:
+            form = inflected[kind, thing]
+            forms[kind] = None if form is None else (type(form).__name__, converter.unstructure(form))
+        record.append((thing.word, thing.lemma.to_str(), ":".join(sorted(thing.tags)), kinds, forms))
+    return record
+
+
+def from_record(record: Record) -> tuple[Classified, Inflected]:
+    classified: Classified = []
+    inflected: Inflected = {}
+    for word, lemma, tags, kinds, forms in record:
+        thing = Word(word, Lemma.from_str(lemma), tags=tags)
+        classified.append((thing, kinds))
+        for kind, form in forms.items():
+            inflected[kind, thing] = None if form is None else converter.structure(form[1], FORM_TYPES[form[0]])
+    return (classified, inflected)
+
+
+@define
+class ExportManifest:
+    """Inflected terms from earlier exports; ``hits`` and ``misses`` count reused and new terms."""
+
+    dict_ids: tuple[str, ...] = field(converter=tuple)
+    path: Path = field(default=DEFAULT_MANIFEST_PATH, converter=Path, kw_only=True)
+    version: int = field(default=INFLECTION_VERSION, kw_only=True)
+    # ``Exclusions.digest`` of the exclusion list the records were made with.
+    exclude: str = field(default="", kw_only=True)
+    _store: DiskCache[Record] = field(init=False, repr=False)
+
+    def __attrs_post_init__(self) -> None:
+        self._store = DiskCache[Record](self.path)
+
+    def key(self, vocab_word: TermDefinition) -> tuple[object, ...]:
+        return (self.version, self.dict_ids, self.exclude, term_hash(vocab_word))
+
+    def get(self, vocab_word: TermDefinition) -> tuple[Classified, Inflected] | None:
+        record = self._store.get(self.key(vocab_word))
+        return None if record is None else from_record(record)
+
+    def put(self, vocab_word: TermDefinition, classified: Classified, inflected: Inflected) -> None:
+        self._store.put(self.key(vocab_word), to_record(classified, inflected))
+
+    @property
+    def hits(self) -> int:
+        return self._store.hits
+
+    @property
+    def misses(self) -> int:
+        return self._store.misses
+
+    def flush(self) -> None:
+        self._store.flush()
+
+    def clear(self) -> None:
+        self._store.clear()
+
+    def close(self) -> None:
+        self._store.close()
+
+
+def inflect_all(inflector: Inflector, classified: Classified) -> Inflected:
+    """Every form of every interpretation, whether or not an earlier term already exported it."""
+    return {(kind, thing): inflector(kind, thing) for thing, kinds in classified for kind in kinds}
+
+
+def export_incremental(
+    data: SizedIterable[TermDefinition],
+    morf: Morf | None = None,
+    manifest: ExportManifest | None = None,
+    batch_size: int = 256,
+    *,
+    seen: Seen | None = None,
+    stats: Stats | None = None,
+    exclude: Exclusions | None = None,
+) -> Generator[tuple[TermDefinition, SomeForm, Stats]]:
+    """``export``, reusing whatever ``manifest`` holds and inflecting only new or changed terms."""
+    m = morf or Morf()
+    manifest = manifest or ExportManifest(m.dict_ids, exclude=exclude.digest if exclude else "")
+    stats = stats or Stats(vocab_count=len(data))
+    inflector = timed_inflector(partial(inflect, m), stats)
+
+    # Forms of the term ``export_classified`` is working on; it asks for them before taking the next term.
+    current: Inflected = {}
+
+    def terms() -> Iterator[tuple[TermDefinition, Classified]]:
+        for chunk in batched(data, batch_size):
+            stored = [manifest.get(vocab_word) for vocab_word in chunk]
+            fresh = analyze_vocabulary([w for w, entry in zip(chunk, stored, strict=True) if entry is None], m, batch_size, stats, exclude)
+
+            for vocab_word, entry in zip(chunk, stored, strict=True):
+                if entry is None:
+                    (_, analysis) = next(fresh)
+                    classified = classify(analysis)
+                    record = (classified, inflect_all(inflector, classified))
+                    manifest.put(vocab_word, *record)
+                else:
+                    record = entry
+
+                current.clear()
+                current.update(record[1])
+                yield (vocab_word, record[0])
+
+    def stored_forms(kind: SomeType, thing: Word) -> SomeForm | None:
+        return current[kind, thing]
+
+    yield from export_classified(terms(), stored_forms, stats, seen)
+    manifest.flush()
@@ -0,0 +1,50 @@
+"""Run-time metrics of the export; timings are in microseconds."""
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+from time import perf_counter
+from typing import Any
+
+from attrs import define, field
+
+
+@define
+class Histogram:
+    count: int = 0
+    total: float = 0
+    min: float | None = None
+    max: float | None = None
+    # Bucket ``i`` counts the values below ``2 ** i`` that did not fit bucket ``i - 1``.
+    buckets: dict[int, int] = field(factory=dict)
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+        bucket = int(value).bit_length()
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def to_json(self) -> dict[str, Any]:
+        return {
+            "count": self.count,
+            "total": self.total,
+            "mean": self.mean,
+            "min": self.min,
+            "max": self.max,
+            "buckets": {f"<{2 ** bucket}": n for bucket, n in sorted(self.buckets.items())},
+        }
+
+
+@contextmanager
+def timed(histogram: Histogram) -> Iterator[None]:
+    """Add the time the block took, in microseconds, to ``histogram``."""
+    start = perf_counter()
+    try:
+        yield
+    finally:
+        histogram.add((perf_counter() - start) * 1e6)
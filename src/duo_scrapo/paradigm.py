@@ -0,0 +1,127 @@
+"""Precompiled tables routing every generated form to its slot in a ``Formy*`` object."""
+
+from collections.abc import Iterable, Mapping, Set
+from functools import cache
+from itertools import product
+from typing import Literal
+
+
+type Pos = Literal["adj", "noun", "pronoun", "verb"]
+type Slot = tuple[str, ...]
+type SlotTable = Mapping[tuple[str, ...], Slot]
+
+
+NUMBERS = {
+    "sg": "liczba_pojedyncza",
+    "pl": "liczba_mnoga",
+}
+
+GENDERS = ("m1", "m2", "m3", "f", "n")
+
+CASES = {
+    "nom": "mianownik",
+    "gen": "dopełniacz",
+    "dat": "celownik",
+    "acc": "biernik",
+    "loc": "miejscownik",
+    "inst": "narzędnik",
+    "voc": "wołacz",
+}
+
+PERSONS = {
+    "pri": "pierwsza_osoba",
+    "sec": "druga_osoba",
+    "ter": "trzecia_osoba",
+}
+
+
+def _plural_gender(gender: str) -> str:
+    return "m1" if gender == "m1" else "reszta"
+
+
+def _noun_table() -> SlotTable:
+    return {
+        (number, case): (NUMBERS[number], CASES[case])
+        for number, case in product(NUMBERS, CASES)
+    }
+
+
+def _adjective_table() -> SlotTable:
+    return {
+        (number, gender, case): (
+            NUMBERS[number],
+            gender if number == "sg" else _plural_gender(gender),
+            CASES[case],
+        )
+        for number, gender, case in product(NUMBERS, GENDERS, CASES)
+    }
+
+
+def _pronoun_table() -> SlotTable:
+    return {
+        (number, gender, case): (NUMBERS[number], gender, CASES[case])
+        for number, gender, case in product(NUMBERS, GENDERS, CASES)
+    }
+
+
+def _verb_table() -> SlotTable:
+    table: dict[tuple[str, ...], Slot] = {("inf",): ("bezokolicznik",)}
+
+    for number, person in product(NUMBERS, PERSONS):
+        table["fin", number, person] = ("_czas_teraźniejszy", NUMBERS[number], PERSONS[person])
+
+    for gender in GENDERS:
+        table["praet", "sg", gender] = ("rdzeń_czasu_przeszłego", NUMBERS["sg"], gender)
+        table["praet", "pl", gender] = ("rdzeń_czasu_przeszłego", NUMBERS["pl"], _plural_gender(gender))
+
+    return table
+
+
+SLOTS: Mapping[Pos, SlotTable] = {
+    "adj": _adjective_table(),
+    "noun": _noun_table(),
+    "pronoun": _pronoun_table(),
+    "verb": _verb_table(),
+}
+
+# Forms carrying any of these tags are left out of the paradigm altogether.
+EXCLUDED: Mapping[Pos, frozenset[str]] = {
+    "adj": frozenset({"com", "sup"}),
+    "noun": frozenset(),
+    "pronoun": frozenset(),
+    "verb": frozenset(),
+}
+
+
+@cache
+def slots_for(pos: Pos, tags: frozenset[str]) -> tuple[Slot, ...]:
+    """The slots a form with ``tags`` fills in the paradigm of ``pos``, in table order."""
+    if tags & EXCLUDED[pos]:
+        return ()
+
+    slots = (slot for key, slot in SLOTS[pos].items() if tags.issuperset(key))
+    return tuple(dict.fromkeys(slots))
+
+
+def fill(forms: object, slot: Slot, value: str) -> None:
+    *path, name = slot
+    obj = forms
+    for attr in path:
+        obj = getattr(obj, attr)
+    setattr(obj, name, value)
+
+
+def fill_all[F](forms: F, pos: Pos, words: Iterable[tuple[str, Set[str]]]) -> F:
+    """Route every ``(word, tags)`` pair into ``forms``; a later form wins a contested slot."""
+    for word, tags in words:
+        for slot in slots_for(pos, frozenset(tags)):
+            fill(forms, slot, word)
+    return forms
+
+
+def pronoun_preference(tags: Set[str]) -> int:
+    """Ranks the variants of a pronoun form, the accented non-post-prepositional one highest.
+
+    ``jego`` ranks above ``niego`` and ``go``, which rank above ``ń``.
+    """
+    return ("akc" in tags) + ("npraep" in tags)
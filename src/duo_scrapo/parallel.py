@@ -0,0 +1,102 @@
+"""Multi-process export: every worker process owns a ``Morf``, and the results are
+replayed in input order, so the output is what ``export`` produces."""
+
+from collections.abc import Generator, Iterable, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from itertools import batched, chain
+import multiprocessing
+import os
+from typing import Literal
+
+from duo_scrapo.Morf import Morf, Word
+from duo_scrapo.export import SizedIterable, SomeForm, SomeType, Stats, export_analyses, inflect, kinds_of
+from duo_scrapo.słowa.słownictwo import TermDefinition
+
+
+type DictName = Literal["sgjp", "polimorf"]
+
+_morf: Morf | None = None
+
+
+class WorkerNotInitialisedError(RuntimeError):
+    def __init__(self) -> None:
+        super().__init__("worker process was not initialised")
+
+
+def _init_worker(dict_names: Sequence[DictName], cache_size: int) -> None:
+    global _morf  # noqa: PLW0603
+    if _morf is None:
+        _morf = Morf(dict_names=dict_names, cache_size=cache_size)
+
+
+def _worker_morf() -> Morf:
+    if _morf is None:
+        raise WorkerNotInitialisedError
+    return _morf
+
+
+def _analyze_chunk(terms: Sequence[str]) -> list[list[Word]]:
+    return [list(words) for words in _worker_morf().analyze_many(terms)]
+
+
+def _inflect_chunk(jobs: Sequence[tuple[SomeType, Word]]) -> list[SomeForm | None]:
+    m = _worker_morf()
+    return [inflect(m, kind, thing) for kind, thing in jobs]
+
+
+def _first_candidates(analyses: Iterable[Iterable[Word]]) -> list[tuple[SomeType, Word]]:
+    """The first interpretation ``export`` tries for every (kind, lemma) pair, in input order."""
+    seen: set[tuple[SomeType, str]] = set()
+    jobs: list[tuple[SomeType, Word]] = []
+
+    for thing in chain.from_iterable(analyses):
+        for kind in kinds_of(thing):
+            if kind != "adverb" and (kind, thing.lemma.word) not in seen:
+                seen.add((kind, thing.lemma.word))
+                jobs.append((kind, thing))
+
+    return jobs
+
+
+def export_parallel(
+    data: SizedIterable[TermDefinition],
+    *,
+    workers: int | None = None,
+    dict_names: DictName | Sequence[DictName] = "polimorf",
+    cache_size: int = 4096,
+    chunk_size: int = 64,
+) -> Generator[tuple[TermDefinition, SomeForm, Stats]]:
+    global _morf  # noqa: PLW0603
+
+    vocab = list(data)
+    names: list[DictName] = [dict_names] if isinstance(dict_names, str) else list(dict_names)
+    workers = workers or os.cpu_count() or 1
+
+    # Loaded before the pool starts so forked workers inherit it.
+    _morf = Morf(dict_names=names, cache_size=cache_size)
+    m = _morf
+
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context("fork" if "fork" in methods else None)
+
+    with ProcessPoolExecutor(workers, mp_context=context, initializer=_init_worker, initargs=(names, cache_size)) as pool:
+        analyses = list(chain.from_iterable(pool.map(
+            _analyze_chunk,
+            [[vocab_word.term for vocab_word in chunk] for chunk in batched(vocab, chunk_size)],
+        )))
+
+        jobs = _first_candidates(analyses)
+        results = dict(zip(
+            jobs,
+            chain.from_iterable(pool.map(_inflect_chunk, batched(jobs, chunk_size))),
+            strict=True,
+        ))
+
+    def inflector(kind: SomeType, thing: Word) -> SomeForm | None:
+        # Only the first candidate of every (kind, lemma) pair was inflected up front;
+        # the rest are only needed when it turns out not to inflect, which is rare.
+        if (kind, thing) in results:
+            return results[kind, thing]
+        return inflect(m, kind, thing)
+
+    yield from export_analyses(zip(vocab, analyses, strict=True), inflector, Stats(vocab_count=len(vocab)))
@@ -1,8 +1,7 @@
-import morfeusz2
-
 from .words.vocab import TermDefinition
 
 from .Morf import Morf, Word
+from .registry import shared_morfeusz
 
 
 def parse_classified_tsv():
@@ -11,16 +10,16 @@ def parse_classified_tsv():
     words: list[tuple[TermDefinition, Word]] = []
 
     with open("out.csv", encoding="utf-8") as f:
-        for line in f:
-            (vocab_word, vocab_lemma, vocab_definition) = line.strip().split("\t")
-            result = list(m.analyze(vocab_lemma))
-            print(f"{vocab_word} ({vocab_lemma}) => {vocab_definition}")
+        rows = [line.strip().split("\t") for line in f]
+
+    for (vocab_word, vocab_lemma, vocab_definition), result in zip(rows, m.analyze_many(row[1] for row in rows), strict=True):
+        print(f"{vocab_word} ({vocab_lemma}) => {vocab_definition}")
 
-            for item in result:
-                if item.lemma.matches(vocab_lemma):
-                    words.append((TermDefinition(term=vocab_word, definition=vocab_definition), item))
+        for item in result:
+            if item.lemma.matches(vocab_lemma):
+                words.append((TermDefinition(term=vocab_word, definition=vocab_definition), item))
 
-    mm = morfeusz2.Morfeusz()
+    mm = shared_morfeusz()
     with open("out2.csv", "w", encoding="utf-8") as f:
         for (vocab_word, word) in words:
             # if "inf" in word.tags:
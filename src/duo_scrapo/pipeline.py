@@ -0,0 +1,159 @@
+"""Staged streaming export: analyse, classify, inflect and pack, each stage on its
+own thread, joined by bounded queues."""
+
+from collections.abc import Callable, Iterable, Iterator
+from functools import partial
+from queue import Empty, Full, Queue
+from threading import Event, Thread
+from typing import Any
+
+from attrs import define, field
+
+from duo_scrapo.Morf import Morf, Word
+from duo_scrapo.exclude import Exclusions
+from duo_scrapo.export import KINDS, Classified, SomeForm, Stats, analyze_vocabulary, classify, export_classified, inflect, timed_inflector
+from duo_scrapo.słowa.słownictwo import TermDefinition
+
+
+STAGES = ("analyse", "classify", "inflect", "pack")
+
+type Fields = tuple[str, ...]
+type Packed = tuple[TermDefinition, SomeForm, Fields, Stats]
+
+
+class _Done:
+    pass
+
+
+class _Stopped(Exception):
+    pass
+
+
+@define
+class _Failed:
+    error: BaseException
+
+
+def pack(vocab_word: TermDefinition, forms: SomeForm) -> Fields:
+    """The note fields of ``forms``: the definition and the term, then the forms themselves."""
+    return (vocab_word.definition, vocab_word.term, *forms.to_rows())
+
+
+@define
+class ExportPipeline:
+    """Runs the export on a thread per stage; iterate it to get packed notes in input order.
+
+    ``vocab_count`` is only used for the stats and may be left out for an iterable
+    without a known length.
+    """
+
+    data: Iterable[TermDefinition]
+    morf: Morf
+    vocab_count: int = field(default=0, kw_only=True)
+    maxsize: int = field(default=256, kw_only=True)
+    batch_size: int = field(default=64, kw_only=True)
+    exclude: Exclusions | None = field(default=None, kw_only=True)
+    stats: Stats = field(init=False)
+    queues: dict[str, Queue[object]] = field(init=False)
+    high_water: dict[str, int] = field(init=False)
+    _stop: Event = field(factory=Event, init=False, repr=False)
+    _threads: list[Thread] = field(factory=list, init=False, repr=False)
+
+    def __attrs_post_init__(self) -> None:
+        self.stats = Stats(vocab_count=self.vocab_count)
+        self.queues = {stage: Queue(self.maxsize) for stage in STAGES}
+        self.high_water = dict.fromkeys(STAGES, 0)
+
+    def depths(self) -> dict[str, int]:
+        """How many items each stage has produced that the next one hasn't taken yet."""
+        return {stage: queue.qsize() for stage, queue in self.queues.items()}
+
+    def _put(self, stage: str, item: object) -> None:
+        queue = self.queues[stage]
+        while not self._stop.is_set():
+            try:
+                queue.put(item, timeout=0.1)
+            except Full:
+                continue
+            self.high_water[stage] = max(self.high_water[stage], queue.qsize())
+            return
+        raise _Stopped
+
+    def _take(self, stage: str) -> Iterator[Any]:
+        """Items produced by ``stage`` until it is done; a failure is passed on and ends the stream."""
+        queue = self.queues[stage]
+        while not self._stop.is_set():
+            try:
+                item = queue.get(timeout=0.1)
+            except Empty:
+                continue
+            if isinstance(item, _Done):
+                return
+            if isinstance(item, _Failed):
+                raise item.error
+            yield item
+
+    def _run(self, stage: str, produce: Callable[[], Iterable[object]]) -> None:
+        try:
+            try:
+                for item in produce():
+                    self._put(stage, item)
+            except _Stopped:
+                raise
+            except BaseException as e:  # noqa: BLE001
+                self._put(stage, _Failed(e))
+            else:
+                self._put(stage, _Done())
+        except _Stopped:
+            pass
+
+    def _analyse(self) -> Iterator[tuple[TermDefinition, list[Word]]]:
+        for vocab_word, analysis in analyze_vocabulary(self.data, self.morf, self.batch_size, self.stats, self.exclude):
+            yield (vocab_word, list(analysis))
+
+    def _classify(self) -> Iterator[tuple[TermDefinition, Classified]]:
+        for vocab_word, analysis in self._take("analyse"):
+            yield (vocab_word, classify(analysis))
+
+    def _inflect(self) -> Iterator[tuple[TermDefinition, SomeForm]]:
+        for vocab_word, forms, _ in export_classified(self._take("classify"), timed_inflector(partial(inflect, self.morf), self.stats), self.stats):
+            yield (vocab_word, forms)
+
+    def _pack(self) -> Iterator[Packed]:
+        for vocab_word, forms in self._take("inflect"):
+            with self.stats.timer("pack", KINDS[type(forms)]):
+                fields = pack(vocab_word, forms)
+            yield (vocab_word, forms, fields, self.stats)
+
+    def __iter__(self) -> Iterator[Packed]:
+        producers: dict[str, Callable[[], Iterable[object]]] = {
+            "analyse": self._analyse,
+            "classify": self._classify,
+            "inflect": self._inflect,
+            "pack": self._pack,
+        }
+        self._stop.clear()
+        self._threads = [
+            Thread(target=self._run, args=(stage, produce), name=f"export-{stage}", daemon=True)
+            for stage, produce in producers.items()
+        ]
+        for thread in self._threads:
+            thread.start()
+
+        try:
+            yield from self._take("pack")
+        finally:
+            self._stop.set()
+            for thread in self._threads:
+                thread.join()
+
+
+def export_pipeline(
+    data: Iterable[TermDefinition],
+    morf: Morf | None = None,
+    *,
+    vocab_count: int = 0,
+    maxsize: int = 256,
+    exclude: Exclusions | None = None,
+) -> ExportPipeline:
+    return ExportPipeline(data, morf or Morf(), vocab_count=vocab_count, maxsize=maxsize, exclude=exclude)
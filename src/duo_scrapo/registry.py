@@ -0,0 +1,104 @@
+"""Process-wide registry of loaded Morfeusz dictionaries, shared by every ``Morf``."""
+
+from pathlib import Path
+from threading import Lock, RLock
+from time import perf_counter
+from typing import Literal, TypedDict, cast
+import os
+import resource
+
+from attrs import define, field
+from morfeusz2 import Morfeusz
+
+
+type MorfeuszOptions = tuple[tuple[str, object], ...]
+type RegistryKey = tuple[str | None, str | None, MorfeuszOptions]
+
+
+class MorfeuszFlags(TypedDict, total=False):
+    analyse: bool
+    generate: bool
+    expand_dag: bool
+    expand_tags: bool
+    expand_dot: bool
+    expand_underscore: bool
+    aggl: str | None
+    praet: str | None
+    separate_numbering: bool
+    case_handling: Literal[100, 101, 102]
+    whitespace: Literal[301, 302, 303]
+
+
+DICT_PATH = "/usr/share/morfeusz2/dictionaries"
+
+
+def rss_bytes() -> int:
+    """The resident set size of this process, or its peak where the current one is unknown."""
+    try:
+        pages = int(Path("/proc/self/statm").read_text(encoding="ascii").split()[1])
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    return pages * os.sysconf("SC_PAGE_SIZE")
+
+
+@define
+class LoadedMorfeusz:
+    morfeusz: Morfeusz = field(repr=False)
+    dict_name: str | None
+    dict_id: str
+    options: MorfeuszOptions = field(repr=False)
+    load_seconds: float
+    rss_bytes: int
+    # Morfeusz is not thread-safe; hold it while calling the instance.
+    lock: RLock = field(factory=RLock, repr=False)
+
+
+@define
+class MorfeuszRegistry:
+    _entries: dict[RegistryKey, LoadedMorfeusz] = field(factory=dict, init=False)
+    _lock: Lock = field(factory=Lock, init=False, repr=False)
+
+    def get(self, dict_name: str | None = None, options: MorfeuszOptions = (), *, dict_path: str | None = None) -> Morfeusz:
+        return self.entry(dict_name, options, dict_path=dict_path).morfeusz
+
+    def entry(self, dict_name: str | None = None, options: MorfeuszOptions = (), *, dict_path: str | None = None) -> LoadedMorfeusz:
+        key = (dict_name, dict_path, options)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._entries[key] = self._load(dict_name, options, dict_path)
+
+        return entry
+
+    @staticmethod
+    def _load(dict_name: str | None, options: MorfeuszOptions, dict_path: str | None) -> LoadedMorfeusz:
+        rss = rss_bytes()
+        start = perf_counter()
+
+        # The options are kept as pairs so that they can be part of the registry key.
+        m = Morfeusz(dict_name=dict_name, dict_path=dict_path, **cast(MorfeuszFlags, dict(options)))
+
+        return LoadedMorfeusz(
+            morfeusz=m,
+            dict_name=dict_name,
+            dict_id=m.dict_id(),
+            options=options,
+            load_seconds=perf_counter() - start,
+            rss_bytes=rss_bytes() - rss,
+        )
+
+    def entries(self) -> list[LoadedMorfeusz]:
+        with self._lock:
+            return list(self._entries.values())
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+REGISTRY = MorfeuszRegistry()
+
+
+def shared_morfeusz(dict_name: str | None = None, options: MorfeuszOptions = (), *, dict_path: str | None = None) -> Morfeusz:
+    return REGISTRY.get(dict_name, options, dict_path=dict_path)
@@ -0,0 +1,126 @@
+"""Sharded export: a shard inflects only the lemmas that hash to it, and merging the
+shards gives the rows of a single-process run, in the same order."""
+
+from collections.abc import Iterable, Iterator
+from heapq import merge
+from pathlib import Path
+from typing import Self
+import json
+import zlib
+
+from attrs import define
+
+from duo_scrapo.Morf import Morf, Word
+from duo_scrapo.exclude import Exclusions
+from duo_scrapo.export import Seen, SizedIterable, SomeType, Stats, analyze_vocabulary, classify, inflect, timed_inflector
+from duo_scrapo.pipeline import pack
+from duo_scrapo.słowa.słownictwo import TermDefinition
+
+
+def shard_of(kind: SomeType, lemma: str, count: int) -> int:
+    """The shard of a (part of speech, lemma) pair; the same in every process and on every machine."""
+    return zlib.crc32(f"{kind}:{lemma}".encode()) % count
+
+
+class ShardOutOfRangeError(ValueError):
+    def __init__(self, index: int, count: int):
+        super().__init__(f"shard {index} out of range for {count} shards")
+
+
+@define(frozen=True)
+class Shard:
+    index: int
+    count: int
+
+    def __attrs_post_init__(self) -> None:
+        if not 0 <= self.index < self.count:
+            raise ShardOutOfRangeError(self.index, self.count)
+
+    @classmethod
+    def parse(cls, spec: str) -> Self:
+        """``"i/N"``, e.g. ``"0/4"`` for the first of four shards."""
+        index, _, count = spec.partition("/")
+        return cls(int(index), int(count))
+
+    def __str__(self) -> str:
+        return f"{self.index}/{self.count}"
+
+
+@define(frozen=True)
+class ShardRow:
+    # Index of the term, then of the (interpretation, part of speech) pair within it.
+    position: tuple[int, int]
+    kind: SomeType
+    lemma: str
+    row: tuple[str, ...]
+
+    def to_json(self) -> str:
+        return json.dumps([*self.position, self.kind, self.lemma, *self.row], ensure_ascii=False)
+
+    @classmethod
+    def from_json(cls, line: str) -> Self:
+        term, pair, kind, lemma, *row = json.loads(line)
+        return cls((term, pair), kind, lemma, tuple(row))
+
+
+def export_shard(
+    data: SizedIterable[TermDefinition],
+    shard: Shard,
+    morf: Morf | None = None,
+    stats: Stats | None = None,
+    exclude: Exclusions | None = None,
+) -> Iterator[ShardRow]:
+    """Export the pairs of ``shard``, deduplicated as ``export_classified`` does it."""
+    m = morf or Morf()
+    stats = stats or Stats(vocab_count=len(data))
+    inflector = timed_inflector(lambda kind, thing: inflect(m, kind, thing), stats)
+    seen = Seen()
+
+    for term, (vocab_word, analysis) in enumerate(analyze_vocabulary(data, m, stats=stats, exclude=exclude)):
+        pairs: Iterator[tuple[Word, SomeType]] = ((thing, kind) for thing, kinds in classify(analysis) for kind in kinds)
+        for pair, (thing, kind) in enumerate(pairs):
+            lemma = thing.lemma.word
+            if shard_of(kind, lemma, shard.count) != shard.index or (kind, lemma) in seen:
+                continue
+
+            forms = inflector(kind, thing)
+            if forms is not None:
+                seen.add(kind, lemma)
+                stats.log(kind)
+                with stats.timer("pack", kind):
+                    row = (type(forms).__name__, *pack(vocab_word, forms))
+                yield ShardRow((term, pair), kind, lemma, row)
+
+
+def write_shard(path: Path, rows: Iterable[ShardRow]) -> int:
+    count = 0
+    with path.open("w", encoding="utf-8") as f:
+        for row in rows:
+            f.write(row.to_json() + "\n")
+            count += 1
+    return count
+
+
+def read_shard(path: Path) -> Iterator[ShardRow]:
+    with path.open(encoding="utf-8") as f:
+        for line in f:
+            yield ShardRow.from_json(line)
+
+
+def merge_shards(shards: Iterable[Iterable[ShardRow]]) -> Iterator[tuple[str, ...]]:
+    """The rows of all ``shards`` in the order a single run produces them.
+
+    Each shard must be in its own export order. A (part of speech, lemma) pair
+    found in more than one shard, e.g. when a shard was run twice, is kept where it
+    turns up first, as ``export()`` keeps it.
+    """
+    seen = Seen()
+    for row in merge(*shards, key=lambda row: row.position):
+        if (row.kind, row.lemma) in seen:
+            continue
+        seen.add(row.kind, row.lemma)
+        yield row.row
+
+
+def shard_path(shard: Shard) -> Path:
+    return Path(f"export.shard-{shard.index}-of-{shard.count}.jsonl")
@@ -167,7 +167,7 @@ class FormyCzasowników:
 
     # Present tense _form_
     _czas_teraźniejszy: Numbered[VerbPersonForms[str], VerbPersonForms[str]] = attrs.field(
-        default=Numbered[VerbPersonForms[str], VerbPersonForms[str]].empty(
+        factory=lambda: Numbered[VerbPersonForms[str], VerbPersonForms[str]].empty(
             empty_lm=lambda: VerbPersonForms[str].empty(lambda: ""),
             empty_lp=lambda: VerbPersonForms[str].empty(lambda: ""),
         )
@@ -184,7 +184,7 @@ class FormyCzasowników:
 
     bezosobnik: str = attrs.field(default="")
 
-    rdzeń_czasu_przeszłego: Gendered[str] = attrs.field(default=Gendered[str].empty(lambda: ""))
+    rdzeń_czasu_przeszłego: Gendered[str] = attrs.field(factory=lambda: Gendered[str].empty(lambda: ""))
 
     # mówił  = praet:sg:m1.m2.m3:imperf
     # mówiła = praet:sg:f:imperf
@@ -0,0 +1,148 @@
+"""Columnar tables of export results, every value dictionary-encoded."""
+
+from array import array
+from collections.abc import Iterable, Iterator, Sequence
+from pathlib import Path
+import csv
+import json
+import sqlite3
+
+from attrs import define, field
+
+from duo_scrapo.export import FORM_TYPES, SomeForm
+from duo_scrapo.słowa.słownictwo import TermDefinition
+
+
+class RowLengthError(ValueError):
+    def __init__(self, table: str, expected: int, got: int):
+        super().__init__(f"{table}: expected {expected} fields, got {got}")
+
+
+@define
+class Dictionary:
+    """Distinct strings and their codes; a string keeps the code it was first given."""
+
+    values: list[str] = field(factory=list)
+    codes: dict[str, int] = field(factory=dict, repr=False)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def encode(self, value: str) -> int:
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def decode(self, codes: Iterable[int]) -> list[str]:
+        return list(map(self.values.__getitem__, codes))
+
+
+def table_name(form_type: type[SomeForm]) -> str:
+    """``czasowniki`` for ``FormyCzasowników``, after the module the type lives in."""
+    return form_type.__module__.rsplit(".", 1)[-1]
+
+
+@define
+class ResultTable:
+    form_type: type[SomeForm]
+    dictionary: Dictionary = field(factory=Dictionary, repr=False)
+    columns: tuple[str, ...] = field(init=False)
+    _data: list[array[int]] = field(init=False, repr=False)
+
+    def __attrs_post_init__(self) -> None:
+        self.columns = ("en", "pl", *self.form_type.get_cols())
+        self._data = [array("I") for _ in self.columns]
+
+    @property
+    def name(self) -> str:
+        return table_name(self.form_type)
+
+    def __len__(self) -> int:
+        return len(self._data[0])
+
+    def append_row(self, row: Sequence[str]) -> None:
+        if len(row) != len(self.columns):
+            raise RowLengthError(self.name, len(self.columns), len(row))
+        encode = self.dictionary.encode
+        for column, value in zip(self._data, row, strict=True):
+            column.append(encode(value))
+
+    def append(self, vocab_word: TermDefinition, forms: SomeForm) -> None:
+        self.append_row((vocab_word.definition, vocab_word.term, *forms.to_rows()))
+
+    def extend(self, items: Iterable[tuple[TermDefinition, SomeForm]]) -> None:
+        for vocab_word, forms in items:
+            self.append(vocab_word, forms)
+
+    def column(self, name: str) -> list[str]:
+        return self.dictionary.decode(self._data[self.columns.index(name)])
+
+    def rows(self) -> Iterator[tuple[str, ...]]:
+        """Rows in insertion order; every column is decoded in one go rather than cell by cell."""
+        return zip(*(self.dictionary.decode(column) for column in self._data), strict=True)
+
+    def nbytes(self) -> int:
+        return sum(column.itemsize * len(column) for column in self._data)
+
+
+@define
+class ResultTables:
+    """A ``ResultTable`` per part of speech, all sharing one dictionary."""
+
+    dictionary: Dictionary = field(factory=Dictionary, repr=False)
+    tables: dict[type[SomeForm], ResultTable] = field(factory=dict)
+
+    def table(self, form_type: type[SomeForm]) -> ResultTable:
+        table = self.tables.get(form_type)
+        if table is None:
+            table = self.tables[form_type] = ResultTable(form_type, self.dictionary)
+        return table
+
+    def __len__(self) -> int:
+        return sum(map(len, self.tables.values()))
+
+    def extend(self, items: Iterable[tuple[TermDefinition, SomeForm, *tuple[object, ...]]]) -> None:
+        """Append the export results ``items``, e.g. straight from ``export()``."""
+        for vocab_word, forms, *_ in items:
+            self.table(type(forms)).append(vocab_word, forms)
+
+    def extend_rows(self, rows: Iterable[Sequence[str]]) -> None:
+        """Append rows led by the name of their ``Formy*`` type, as a checkpoint stores them."""
+        for type_name, *row in rows:
+            self.table(FORM_TYPES[type_name]).append_row(row)
+
+    def to_tsv(self, directory: Path) -> list[Path]:
+        """Write a ``<table>.tsv`` per part of speech, with a header row."""
+        directory.mkdir(parents=True, exist_ok=True)
+        paths: list[Path] = []
+        for table in self.tables.values():
+            path = directory / f"{table.name}.tsv"
+            with path.open("w", encoding="utf-8", newline="") as f:
+                writer = csv.writer(f, delimiter="\t", lineterminator="\n")
+                writer.writerow(table.columns)
+                writer.writerows(table.rows())
+            paths.append(path)
+        return paths
+
+    def to_jsonl(self, path: Path) -> None:
+        """Write an object per row, the table it belongs to under ``type``."""
+        with path.open("w", encoding="utf-8") as f:
+            for table in self.tables.values():
+                for row in table.rows():
+                    f.write(json.dumps({"type": table.name, **dict(zip(table.columns, row, strict=True))}, ensure_ascii=False) + "\n")
+
+    def to_sqlite(self, path: Path) -> None:
+        """Write a table per part of speech, replacing any table of the same name."""
+        conn = sqlite3.connect(path)
+        try:
+            with conn:
+                for table in self.tables.values():
+                    columns = ", ".join(f'"{column}" TEXT' for column in table.columns)
+                    placeholders = ", ".join("?" for _ in table.columns)
+                    conn.execute(f'DROP TABLE IF EXISTS "{table.name}"')
+                    conn.execute(f'CREATE TABLE "{table.name}" ({columns})')
+                    conn.executemany(f'INSERT INTO "{table.name}" VALUES ({placeholders})', table.rows())  # noqa: S608
+        finally:
+            conn.close()
@@ -1,4 +1,4 @@
-from duo_scrapo.flag import Flag
+from duo_scrapo.flag import BitFlag, Flag
 
 
 class BaseTag(Flag):
@@ -137,6 +137,9 @@ class Tag(Flag):
     FullStoppedness = FULL_STOPPED | NON_FULL_STOPPED
 
 
+BitTag = BitFlag.of(Tag)
+
+
 # class Tag(BaseTag):
 #     pass
 
@@ -0,0 +1,23 @@
+import pytest
+
+from duo_scrapo.Morf import Morf
+from duo_scrapo.export import export
+from duo_scrapo.słowa.słownictwo import TermDefinition
+
+
+# Every part of speech, a repeated term, a phrase and forms of lemmas that turn up earlier.
+TERMS = [
+    "kot", "mówić", "dobry", "ona", "w", "szybko", "jeść", "być", "kot", "dzień dobry",
+    "koty", "mówię", "zamek", "piec", "pisać", "pies", "dom",
+]
+
+
+@pytest.fixture
+def vocab() -> list[TermDefinition]:
+    return [TermDefinition(term=term, definition=term) for term in TERMS]
+
+
+@pytest.fixture
+def expected_rows(vocab: list[TermDefinition]) -> list[tuple[str, ...]]:
+    """The rows a single-process ``export()`` produces for ``vocab``."""
+    return [(type(forms).__name__, word.definition, word.term, *forms.to_rows()) for word, forms, _ in export(vocab, Morf(dict_names="sgjp"))]
@@ -1,6 +1,17 @@
+import anki.collection
 import genanki
 import genanki.note
-from duo_scrapo.ank import main
+from duo_scrapo.ank import (
+    NoteTypeChanges,
+    SyncResult,
+    add_notes_to_collection,
+    main,
+    note_from_row,
+    reconcile_note_type,
+    sync_notes_to_collection,
+    to_model,
+)
+from duo_scrapo.templates import AnkiTemplate
 
 
 def test_note():
@@ -16,3 +27,57 @@ def test_note():
 
 
 test_note()
+
+
+def test_add_notes_to_collection(tmp_path):
+    notes = [{"Front": f"front {i}", "Back": f"back {i}"} for i in range(3)]
+
+    col = anki.collection.Collection(str(tmp_path / "collection.anki2"))
+    try:
+        basic = to_model(col.models.by_name("Basic"))
+        assert add_notes_to_collection(col, basic, notes) == len(notes)
+        assert col.note_count() == len(notes)
+        assert sorted(col.get_note(note_id)["Front"] for note_id in col.find_notes("")) == ["front 0", "front 1", "front 2"]
+    finally:
+        col.close()
+
+    assert note_from_row(("FormyPrzysłówków", "quickly", "szybko", "szybko")) == {"pl": "szybko", "en": "quickly", "form": "szybko"}
+
+
+def test_sync_notes_to_collection(tmp_path):
+    col = anki.collection.Collection(str(tmp_path / "collection.anki2"))
+    try:
+        basic = to_model(col.models.by_name("Basic"))
+        notes = [{"Front": f"front {i}", "Back": f"back {i}"} for i in range(3)]
+        notes[2]["Front"] = "front 0"
+
+        assert sync_notes_to_collection(col, basic, notes) == SyncResult(added=3)
+        ids = sorted(col.find_notes(""))
+        assert sync_notes_to_collection(col, basic, notes, batch_size=1) == SyncResult(unchanged=3)
+
+        notes[1]["Back"] = "changed"
+        assert sync_notes_to_collection(col, basic, [*notes, {"Front": "front 3", "Back": "back 3"}]) == SyncResult(added=1, updated=1, unchanged=2)
+        assert sorted(col.find_notes(""))[:3] == ids
+        assert col.get_note(ids[1])["Back"] == "changed"
+    finally:
+        col.close()
+
+
+def test_reconcile_note_type(tmp_path):
+    templates = [AnkiTemplate("Karta 1", qfmt="{{pl}}", afmt="{{en}}"), AnkiTemplate("Karta 2", qfmt="{{en}}", afmt="{{pl}}")]
+    col = anki.collection.Collection(str(tmp_path / "collection.anki2"))
+    try:
+        (_, changes) = reconcile_note_type(col, "Słowa", ("pl", "en"), templates)
+        assert changes.created
+        mod = col.models.by_name("Słowa")["mod"]
+
+        assert reconcile_note_type(col, "Słowa", ("pl", "en"), templates)[1] == NoteTypeChanges()
+        assert col.models.by_name("Słowa")["mod"] == mod
+
+        templates[1] = AnkiTemplate("Karta 2", qfmt="{{en}}?", afmt="{{pl}}")
+        (model, changes) = reconcile_note_type(col, "Słowa", ("pl", "en", "uwagi"), templates[1:], prune_templates=True)
+        assert changes == NoteTypeChanges(fields=["uwagi"], updated_templates=["Karta 2"], removed_templates=["Karta 1"])
+        assert [field["name"] for field in model["flds"]] == ["pl", "en", "uwagi"]
+        assert [template["qfmt"] for template in model["tmpls"]] == ["{{en}}?"]
+    finally:
+        col.close()
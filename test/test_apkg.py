@@ -0,0 +1,124 @@
+import errno
+import os
+import sqlite3
+import zipfile
+
+import genanki
+import pytest
+
+from duo_scrapo.apkg import ApkgIndex, ApkgWriter
+
+
+MODEL = genanki.Model(
+    1607392319,
+    "Słowa",
+    fields=[{"name": "pl"}, {"name": "en"}],
+    templates=[
+        {"name": "Karta 1", "qfmt": "{{pl}}", "afmt": "{{en}}"},
+        {"name": "Karta 2", "qfmt": "{{en}}", "afmt": "{{pl}}"},
+    ],
+)
+
+
+def notes():
+    return [genanki.Note(model=MODEL, fields=[f"pl {i}", f"en {i}"]) for i in range(25)]
+
+
+def contents(path, tmp_path):
+    with zipfile.ZipFile(path) as package:
+        db = package.extract("collection.anki2", tmp_path / path.stem)
+    conn = sqlite3.connect(db)
+    try:
+        return {table: conn.execute(f"SELECT * FROM {table} ORDER BY id").fetchall() for table in ("col", "notes", "cards")}  # noqa: S608
+    finally:
+        conn.close()
+
+
+def test_apkg_writer_matches_genanki(tmp_path):
+    deck = genanki.Deck(2059400110, "Słowa")
+    for note in notes():
+        deck.add_note(note)
+    genanki.Package(deck).write_to_file(tmp_path / "genanki.apkg", timestamp=1700000000)
+
+    with ApkgWriter(tmp_path / "stream.apkg", genanki.Deck(2059400110, "Słowa"), timestamp=1700000000, commit_every=10) as writer:
+        for note in notes():
+            writer.add(note)
+
+    assert writer.notes == len(notes())
+    assert contents(tmp_path / "stream.apkg", tmp_path) == contents(tmp_path / "genanki.apkg", tmp_path)
+    assert sorted(path.name for path in tmp_path.iterdir() if path.is_file()) == ["genanki.apkg", "stream.apkg"]
+
+
+def test_apkg_writer_keeps_previous_package_if_writing_fails(tmp_path, monkeypatch):
+    path = tmp_path / "deck.apkg"
+    path.write_bytes(b"previous")
+
+    def fail(*args, **kwargs):
+        raise OSError(errno.ENOSPC, os.strerror(errno.ENOSPC))
+
+    monkeypatch.setattr(zipfile.ZipFile, "write", fail)
+    writer = ApkgWriter(path, genanki.Deck(2059400110, "Słowa"))
+    writer.add(notes()[0])
+    with pytest.raises(OSError, match=os.strerror(errno.ENOSPC)):
+        writer.close()
+
+    assert path.read_bytes() == b"previous"
+    assert list(tmp_path.iterdir()) == [path]
+
+
+def test_apkg_writer_discards_on_error(tmp_path):
+    def write_and_fail():
+        with ApkgWriter(tmp_path / "deck.apkg", genanki.Deck(2059400110, "Słowa")) as writer:
+            writer.add(notes()[0])
+            raise RuntimeError
+
+    with pytest.raises(RuntimeError):
+        write_and_fail()
+
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_apkg_index_keeps_guids_of_changed_notes(tmp_path):
+    model = genanki.Model(1607392320, "Formy", fields=[{"name": "en"}, {"name": "pl"}, {"name": "forma"}], templates=MODEL.templates)
+
+    def export(forms):
+        index = ApkgIndex(tmp_path / "index.sqlite")
+        notes = [genanki.Note(model=model, fields=["cat", term, form]) for term, form in forms.items()]
+        shipped = [note.guid for note in notes if index.stamp(note)]
+        index.commit()
+        index.close()
+        return (shipped, [note.guid for note in notes], (index.new, index.changed, index.unchanged))
+
+    (shipped, guids, counts) = export({"kot": "kota", "pies": "psa"})
+    assert shipped == guids
+    assert counts == (2, 0, 0)
+
+    (shipped, guids_again, counts) = export({"kot": "kota", "pies": "psa!", "mysz": "myszy"})
+    assert guids_again[:2] == guids
+    assert shipped == guids_again[1:]
+    assert counts == (1, 1, 1)
+
+    assert export({"kot": "kota", "pies": "psa!", "mysz": "myszy"})[0] == []
+
+
+def test_apkg_index_tells_lemmas_of_one_term_apart(tmp_path):
+    model = genanki.Model(1607392321, "Czasowniki", fields=[{"name": "en"}, {"name": "pl"}, {"name": "bezokolicznik"}, {"name": "teraz_sg_1p"}], templates=MODEL.templates)
+
+    def export(lemmas):
+        with ApkgIndex(tmp_path / "index.sqlite") as index:
+            notes = [genanki.Note(model=model, fields=["I have", "mam", *forms]) for forms in lemmas]
+            shipped = [note.guid for note in notes if index.stamp(note)]
+            index.commit()
+        return (shipped, [note.guid for note in notes])
+
+    (_, guids) = export([("mieć", "mam"), ("mamić", "mamię")])
+    assert len(set(guids)) == len(guids)
+
+    (shipped, guids_again) = export([("mieć", "mam"), ("mamić", "mamię!")])
+    assert guids_again == guids
+    assert shipped == guids[1:]
+
+    # Notes that share even the lemma field are kept apart by all of their fields.
+    (_, same) = export([("mieć", "mam"), ("mieć", "mam?")])
+    assert len(set(same)) == len(same)
+    assert export([("mieć", "mam"), ("mieć", "mam?")])[0] == []
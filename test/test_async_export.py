@@ -0,0 +1,32 @@
+import asyncio
+
+from duo_scrapo.Morf import Morf
+from duo_scrapo.async_export import export_async
+
+
+async def collect(source, **kwargs):
+    return [
+        (type(forms).__name__, word.definition, word.term, *forms.to_rows())
+        async for word, forms in export_async(source, Morf(dict_names="sgjp"), **kwargs)
+    ]
+
+
+async def trickle(vocab):
+    for vocab_word in vocab:
+        await asyncio.sleep(0)
+        yield vocab_word
+
+
+def test_export_async_matches_export(vocab, expected_rows):
+    assert asyncio.run(collect(vocab, concurrency=1, batch_size=3)) == expected_rows
+    assert asyncio.run(collect(trickle(vocab), concurrency=1, batch_size=5)) == expected_rows
+
+
+def test_export_async_concurrent_exports_every_lemma_once(vocab, expected_rows):
+    # Batches complete in any order, so a lemma may be exported for another of its terms.
+    exported = asyncio.run(collect(trickle(vocab), concurrency=3, batch_size=2))
+
+    def lemmas(rows):
+        return sorted((type_name, *forms) for type_name, _, __, *forms in rows)
+
+    assert lemmas(exported) == lemmas(expected_rows)
@@ -0,0 +1,39 @@
+import pytest
+
+from duo_scrapo.flag import BitFlag, Flag
+from duo_scrapo.tag import BitTag, Tag
+
+
+class FLG(Flag):
+    A = "a"
+    B = "b"
+    C = "c"
+
+    E = frozenset({"a", "b"})
+
+
+BitFLG = BitFlag.of(FLG)
+
+
+def test_bit_flag_members():
+    assert [m.name for m in BitFLG] == ["A", "B", "C"]
+    assert BitFLG.E == BitFLG.A | BitFLG.B  # type: ignore[attr-defined]
+    assert str(BitFLG.E) == "a.b"  # type: ignore[attr-defined]
+
+
+def test_bit_flag_matches_flag():
+    assert (BitTag.Number & {"sg", "nom"}) == BitTag.SINGULAR  # type: ignore[attr-defined]
+    assert BitTag.Gender >= {"m1", "f"}  # type: ignore[attr-defined]
+    assert BitTag.MASCULINE_HUMAN in BitTag.Masculine  # type: ignore[attr-defined]
+    assert BitTag.Masculine < BitTag.Gender  # type: ignore[attr-defined]
+    assert BitTag.Gender - BitTag.Masculine == {"f", "n"}  # type: ignore[attr-defined]
+
+    for member in Tag:
+        assert BitTag[member.name].to_set() == member.value
+
+
+def test_bit_flag_mask_of_ignores_unknown_values():
+    assert BitTag.mask_of({"subst", "xyz"}) == BitTag.NOUN  # type: ignore[attr-defined]
+
+    with pytest.raises(TypeError):
+        BitTag.NOUN | 1.5  # type: ignore[attr-defined]
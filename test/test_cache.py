@@ -0,0 +1,99 @@
+from pathlib import Path
+
+from duo_scrapo.cache import DiskCache, LRUCache
+from duo_scrapo.Morf import Morf
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = LRUCache[str, int](maxsize=2)
+
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+
+    cache.put("c", 3)
+
+    assert "a" in cache
+    assert "b" not in cache
+    assert "c" in cache
+    assert cache.evictions == 1
+
+
+def test_lru_cache_counts_hits_and_misses():
+    cache = LRUCache[str, int](maxsize=2)
+
+    assert cache.get_or_compute("a", lambda: 1) == 1
+    assert cache.get_or_compute("a", lambda: 2) == 1
+
+    assert (cache.hits, cache.misses, cache.hit_ratio) == (1, 1, 0.5)
+
+
+def test_lru_cache_disabled():
+    cache = LRUCache[str, int](maxsize=0)
+
+    cache.put("a", 1)
+
+    assert len(cache) == 0
+    assert cache.get("a") is None
+
+
+def test_morf_generate_is_cached():
+    m = Morf(dict_names="sgjp")
+
+    first = list(m.generate("kot"))
+    second = list(m.generate("kot"))
+
+    assert first == second
+    assert m.cache.misses == 1
+    assert m.cache.hits == 1
+
+
+def test_disk_cache_survives_reopen(tmp_path: Path):
+    path = tmp_path / "cache.sqlite"
+
+    cache = DiskCache[list[int]](path)
+    cache.put(("a", 1), [1, 2])
+    cache.close()
+
+    cache = DiskCache[list[int]](path)
+    assert cache.get(("a", 1)) == [1, 2]
+    assert cache.get(("a", 2)) is None
+    cache.close()
+
+
+def test_morf_warm_run_reads_from_disk(tmp_path: Path):
+    path = tmp_path / "cache.sqlite"
+
+    cold = Morf(dict_names="sgjp", cache_path=path)
+    expected = list(cold.generate("kot"))
+    cold.close()
+
+    warm = Morf(dict_names="sgjp", cache_path=path)
+    assert list(warm.generate("kot")) == expected
+    assert warm.store is not None
+    assert warm.store.hits == 1
+    assert warm.store.misses == 0
+    warm.close()
+
+
+def test_decliners_share_lemma_index():
+    m = Morf(dict_names="sgjp")
+
+    assert m.conjugate_verb("mówić") is not None
+    assert m.decline_noun("mówić") is None
+    assert m.decline_adjective("mówić") is None
+
+    assert (m.lemmas.misses, m.lemmas.hits) == (1, 2)
+
+
+def test_decliners_share_paradigm():
+    m = Morf(dict_names="sgjp")
+    word = next(w for w in m.analyze("kot") if w.is_noun())
+
+    first = m.decline_noun(word)
+    again = m.decline_noun(word)
+
+    assert first == again
+    assert m.paradigm(word.lemma.to_str()) is m.paradigm(word.lemma.to_str())
+    assert m.calls["generate"] == 1
+    assert m.paradigms.misses == 1
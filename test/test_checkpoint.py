@@ -0,0 +1,56 @@
+import pytest
+
+from duo_scrapo.Morf import Morf
+from duo_scrapo.checkpoint import Checkpoint, resume_export
+from duo_scrapo.export import Stats, export, export_czasowniki
+
+
+class Crash(Exception):
+    pass
+
+
+def test_resume_export_after_crash(tmp_path, vocab, expected_rows):
+    m = Morf(dict_names="sgjp")
+    every, crash_after = 4, 6
+
+    def exporter(rest, state):
+        state.stats = state.stats or Stats(vocab_count=len(vocab))
+        return export(rest, m, seen=state.seen, stats=state.stats)
+
+    def crashing(rest, state):
+        for count, item in enumerate(exporter(rest, state)):
+            if count == crash_after:
+                raise Crash
+            yield item
+
+    checkpoint = Checkpoint(tmp_path / "run.checkpoint", every=every)
+    with pytest.raises(Crash):
+        list(resume_export(vocab, crashing, checkpoint))
+
+    assert checkpoint.path.exists()
+    assert len(list(checkpoint.rows())) == crash_after
+
+    resumed = list(resume_export(vocab, exporter, checkpoint, resume=True))
+
+    assert list(checkpoint.rows()) == expected_rows
+    assert len(resumed) == len(expected_rows) - every
+    assert resumed[-1][2].processed == len(expected_rows)
+    assert not checkpoint.path.exists()
+
+
+def test_resume_export_czasowniki_after_stop(tmp_path, vocab):
+    m = Morf(dict_names="sgjp")
+    expected = [(word.term, forms.to_rows()) for word, forms in export_czasowniki(vocab, m)]
+
+    def exporter(rest, state):
+        return export_czasowniki(rest, m, seen=state.seen)
+
+    checkpoint = Checkpoint(tmp_path / "run.checkpoint", every=1)
+    run = resume_export(vocab, exporter, checkpoint)
+    stopped = [next(run) for _ in range(3)]
+    run.close()
+
+    resumed = list(resume_export(vocab, exporter, checkpoint, resume=True))
+
+    assert [(word.term, forms.to_rows()) for word, forms in stopped + resumed] == expected
+    assert len(list(checkpoint.rows())) == len(expected)
@@ -0,0 +1,35 @@
+from duo_scrapo.Morf import Lemma, Morf
+from duo_scrapo.exclude import Exclusions
+from duo_scrapo.export import Stats, export
+from duo_scrapo.słowa.słownictwo import TermDefinition
+
+
+def test_exclusions_match_lemmas():
+    exclude = Exclusions(["i:C", "dzięk", "nie*", "*:I"])
+
+    assert exclude.excludes(Lemma.from_str("i:C"))
+    assert not exclude.excludes(Lemma.from_str("i:T"))
+    assert exclude.excludes(Lemma.from_str("dzięk"))
+    assert exclude.excludes(Lemma.from_str("niebo"))
+    assert exclude.excludes(Lemma.from_str("tak:I"))
+    assert not exclude.excludes(Lemma.from_str("tak:D"))
+
+    assert exclude.excludes_term("dzięk")
+    assert exclude.excludes_term("niebieski")
+    assert not exclude.excludes_term("i")
+    assert Exclusions(["a", "b"]).digest == Exclusions(["b", "a", "a"]).digest
+
+
+def test_export_skips_excluded():
+    vocab = [TermDefinition(term=term, definition=term) for term in ["kot", "tak", "niebo", "szybko"]]
+    m = Morf(dict_names="sgjp")
+    stats = Stats(vocab_count=len(vocab))
+
+    def rows(**kwargs):
+        return [(word.term, type(forms).__name__, forms.to_rows()) for word, forms, _ in export(vocab, m, **kwargs)]
+
+    expected = [row for row in rows() if row[0] != "niebo" and row[:2] != ("tak", "FormyPrzysłówków")]
+
+    assert rows(stats=stats, exclude=Exclusions(["nie*", "tak:D"])) == expected
+    assert stats.excluded_terms == 1
+    assert stats.excluded_interpretations == 1
@@ -0,0 +1,41 @@
+from duo_scrapo.Morf import Morf
+from duo_scrapo.export import Seen, export
+from duo_scrapo.metrics import Histogram
+from duo_scrapo.słowa.słownictwo import TermDefinition
+
+
+def test_seen_tracks_lemmas_per_kind():
+    seen = Seen()
+    seen.add("noun", "kot")
+
+    assert ("noun", "kot") in seen
+    assert ("verb", "kot") not in seen
+    assert ("noun", "pies") not in seen
+    assert seen.has_lemma("kot")
+    assert not seen.has_lemma("pies")
+
+
+def test_stats_records_timings_and_morfeusz_metrics():
+    vocab = [TermDefinition(term=term, definition=term) for term in ["kot", "mówić", "w", "szybko"]]
+    m = Morf(dict_names="sgjp")
+
+    (*_, (_, __, stats)) = export(vocab, m)
+
+    assert (stats.prepositions, stats.adverbs) == (1, 1)
+    assert stats.unhandled == stats.vocab_count - stats.processed
+
+    report = stats.to_json(m)
+    assert report["timings_us"]["analyse"]["count"] == 1
+    assert report["timings_us"]["generate.verb"]["count"] == 1
+    forms_per_lemma = report["morfeusz"]["forms_per_lemma"]
+    assert report["morfeusz"]["calls"]["generate"] == sum(histogram["count"] for histogram in forms_per_lemma.values())
+    assert forms_per_lemma["verb"]["min"] > forms_per_lemma["noun"]["max"]
+
+
+def test_histogram_buckets():
+    histogram = Histogram()
+    for value in (0, 1, 3, 4, 1000):
+        histogram.add(value)
+
+    assert histogram.to_json()["buckets"] == {"<1": 1, "<2": 1, "<4": 1, "<8": 1, "<1024": 1}
+    assert (histogram.min, histogram.max, histogram.mean) == (0, 1000, 201.6)
@@ -0,0 +1,27 @@
+from duo_scrapo.Morf import Morf
+from duo_scrapo.manifest import ExportManifest, export_incremental
+from duo_scrapo.słowa.słownictwo import TermDefinition
+
+
+def rows(exported):
+    return [(type(forms).__name__, word.term, *forms.to_rows()) for word, forms, _ in exported]
+
+
+def test_export_incremental_reuses_unchanged_terms(tmp_path, vocab, expected_rows):
+    m = Morf(dict_names="sgjp")
+    # The definition of a term changes below, which must not change its forms.
+    expected = [(kind, term, *forms) for kind, _, term, *forms in expected_rows]
+
+    first = ExportManifest(m.dict_ids, path=tmp_path / "manifest.sqlite")
+    assert rows(export_incremental(vocab, m, first)) == expected
+    assert (first.hits, first.misses) == (0, len(vocab))
+    first.close()
+
+    vocab[1] = TermDefinition(term="mówić", definition="to speak")
+    second = ExportManifest(m.dict_ids, path=tmp_path / "manifest.sqlite")
+    assert rows(export_incremental(vocab, m, second)) == expected
+    assert (second.hits, second.misses) == (len(vocab) - 1, 1)
+    second.close()
+
+    other = ExportManifest(m.dict_ids, path=tmp_path / "manifest.sqlite", version=0)
+    assert other.get(vocab[0]) is None
@@ -0,0 +1,10 @@
+from duo_scrapo.Morf import Morf
+
+
+def test_morf_analyze_many_matches_analyze():
+    terms = ["kot", "dzień dobry", "mówić", "", "kot", "a|b", "ok."]
+
+    expected = [list(Morf(dict_names="sgjp").analyze(term)) for term in terms]
+    actual = [list(words) for words in Morf(dict_names="sgjp").analyze_many(terms, batch_size=4)]
+
+    assert actual == expected
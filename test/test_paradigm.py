@@ -0,0 +1,46 @@
+from duo_scrapo.Morf import Morf
+from duo_scrapo.paradigm import slots_for
+
+
+def test_slots_for_adjective_plural():
+    assert slots_for("adj", frozenset({"adj", "pl", "nom", "voc", "m1", "pos"})) == (
+        ("liczba_mnoga", "m1", "mianownik"),
+        ("liczba_mnoga", "m1", "wołacz"),
+    )
+    assert slots_for("adj", frozenset({"adj", "pl", "nom", "m2", "m3", "f", "n", "pos"})) == (
+        ("liczba_mnoga", "reszta", "mianownik"),
+    )
+    assert slots_for("adj", frozenset({"adj", "sg", "nom", "m1", "com"})) == ()
+
+
+def test_slots_for_verb():
+    assert slots_for("verb", frozenset({"inf", "imperf"})) == (("bezokolicznik",),)
+    assert slots_for("verb", frozenset({"fin", "pl", "sec", "imperf"})) == (
+        ("_czas_teraźniejszy", "liczba_mnoga", "druga_osoba"),
+    )
+
+
+def test_morf_decline_dobry():
+    m = Morf(dict_names="sgjp")
+    word = next(w for w in m.analyze("dobry") if w.is_adj())
+    result = m.decline_adjective(word)
+
+    assert result is not None
+
+    assert result.liczba_pojedyncza.m1.mianownik == "dobry"
+    assert result.liczba_pojedyncza.m1.dopełniacz == "dobrego"
+    assert result.liczba_pojedyncza.f.narzędnik == "dobrą"
+    assert result.liczba_mnoga.m1.mianownik == "dobrzy"
+    assert result.liczba_mnoga.reszta.mianownik == "dobre"
+
+
+def test_morf_decline_on():
+    m = Morf(dict_names="sgjp")
+    word = next(w for w in m.analyze("on") if w.is_pron())
+    result = m.decline_pronoun(word)
+
+    assert result is not None
+
+    assert result.liczba_pojedyncza.m1.dopełniacz == "jego"
+    assert result.liczba_pojedyncza.f.biernik == "ją"
+    assert result.liczba_mnoga.f.mianownik == "one"
@@ -0,0 +1,7 @@
+from duo_scrapo.parallel import export_parallel
+
+
+def test_export_parallel_matches_export(vocab, expected_rows):
+    exported = export_parallel(vocab, workers=2, dict_names="sgjp", chunk_size=3)
+
+    assert [(type(forms).__name__, word.definition, word.term, *forms.to_rows()) for word, forms, _ in exported] == expected_rows
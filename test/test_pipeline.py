@@ -0,0 +1,21 @@
+from duo_scrapo.Morf import Morf
+from duo_scrapo.pipeline import ExportPipeline
+
+
+def test_export_pipeline_matches_export(vocab, expected_rows):
+    maxsize = 2
+    pipeline = ExportPipeline(vocab, Morf(dict_names="sgjp"), vocab_count=len(vocab), maxsize=maxsize, batch_size=3)
+    packed = list(pipeline)
+
+    assert [(type(forms).__name__, *fields) for _, forms, fields, _ in packed] == expected_rows
+    assert max(pipeline.high_water.values()) <= maxsize
+
+
+def test_export_pipeline_stops_early(vocab):
+    pipeline = ExportPipeline(vocab * 50, Morf(dict_names="sgjp"), maxsize=2, batch_size=3)
+    packed = iter(pipeline)
+
+    next(packed)
+    packed.close()
+
+    assert not any(thread.is_alive() for thread in pipeline._threads)
@@ -0,0 +1,16 @@
+from duo_scrapo.Morf import Morf
+from duo_scrapo.registry import REGISTRY
+
+
+def test_morfs_share_morfeusz():
+    a = Morf(dict_names="sgjp")
+    b = Morf(dict_names="sgjp", cache_size=0)
+    c = Morf(dict_names="sgjp", expand_dag=False)
+
+    assert a.morfeuszes[0] is b.morfeuszes[0]
+    assert a.morfeuszes[0] is not c.morfeuszes[0]
+
+    loaded = {(entry.dict_name, entry.options): entry for entry in REGISTRY.entries()}
+    entry = loaded["sgjp", a.options]
+    assert entry.dict_id == a.dict_ids[0]
+    assert entry.load_seconds > 0
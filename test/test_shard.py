@@ -0,0 +1,27 @@
+import pytest
+
+from duo_scrapo.Morf import Morf
+from duo_scrapo.shard import Shard, ShardOutOfRangeError, ShardRow, export_shard, merge_shards
+
+
+def test_shard_parse():
+    assert Shard.parse("2/4") == Shard(2, 4)
+    with pytest.raises(ShardOutOfRangeError):
+        Shard.parse("4/4")
+
+
+@pytest.mark.parametrize("count", [1, 3])
+def test_merged_shards_match_export(count, vocab, expected_rows):
+    m = Morf(dict_names="sgjp")
+    shards = [list(export_shard(vocab, Shard(i, count), m)) for i in range(count)]
+
+    assert sum(map(len, shards)) == len(expected_rows)
+    # The order the shards are merged in, or a shard merged twice, makes no difference.
+    assert list(merge_shards(reversed(shards))) == expected_rows
+    assert list(merge_shards([*shards, shards[0]])) == expected_rows
+
+
+def test_shard_row_round_trip():
+    row = ShardRow((3, 1), "noun", "kot", ("FormyRzeczowników", "cat", "kot", "kota"))
+
+    assert ShardRow.from_json(row.to_json()) == row
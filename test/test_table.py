@@ -0,0 +1,30 @@
+import sqlite3
+
+from duo_scrapo.Morf import Morf
+from duo_scrapo.export import export
+from duo_scrapo.słowa.czasowniki import FormyCzasowników
+from duo_scrapo.table import ResultTables
+
+
+def test_result_tables_round_trip(tmp_path, vocab, expected_rows):
+    tables = ResultTables()
+    tables.extend(export(vocab, Morf(dict_names="sgjp")))
+
+    verbs = tables.tables[FormyCzasowników]
+    verb_rows = [tuple(row) for type_name, *row in expected_rows if type_name == FormyCzasowników.__name__]
+    assert verbs.name == "czasowniki"
+    assert list(verbs.rows()) == verb_rows
+    assert len(tables) == len(expected_rows)
+    assert len(tables.dictionary) < sum(len(table.columns) * len(table) for table in tables.tables.values())
+
+    stored = ResultTables()
+    stored.extend_rows(expected_rows)
+    assert list(stored.tables[FormyCzasowników].rows()) == verb_rows
+
+    tables.to_sqlite(tmp_path / "export.sqlite")
+    with sqlite3.connect(tmp_path / "export.sqlite") as conn:
+        assert conn.execute('SELECT * FROM "czasowniki"').fetchall() == verb_rows
+
+    (tsv, *_) = tables.to_tsv(tmp_path / "tsv")
+    first = next(iter(tables.tables.values()))
+    assert tsv.read_text(encoding="utf-8").splitlines()[0].split("\t") == list(first.columns)
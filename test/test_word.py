@@ -0,0 +1,40 @@
+import pickle  # noqa: S403
+
+from duo_scrapo.Morf import Lemma, Word, WordList
+
+
+def test_words_share_tags_and_lemmas():
+    a = Word(word="kota", lemma=Lemma.from_str("kot:Sm1"), tags="subst:sg:gen.acc:m1")
+    b = Word(word="kot", lemma=Lemma.from_str("kot:Sm1"), tags="subst:sg:gen.acc:m1")
+
+    assert a.tags is b.tags
+    assert a.lemma is b.lemma
+    assert a.is_noun()
+
+
+def test_word_survives_pickling():
+    word = Word(word="kota", lemma=Lemma.from_str("kot:Sm1"), tags="subst:sg:gen.acc:m1", data1=["pospolita"])
+
+    copy = pickle.loads(pickle.dumps(word))  # noqa: S301
+
+    assert copy == word
+    assert hash(copy) == hash(word)
+    assert copy.mask == word.mask
+    assert copy.data1 == frozenset({"pospolita"})
+
+
+def test_word_list_keeps_first_of_equal_words():
+    lemma = Lemma.from_str("kot:Sm1")
+    first = Word(word="kota", lemma=lemma, tags="subst:sg:gen.acc:m1", data1=["pospolita"])
+    second = Word(word="kota", lemma=lemma, tags="subst:sg:gen.acc:m1")
+    other = Word(word="kot", lemma=lemma, tags="subst:sg:nom:m1")
+
+    words = WordList([first, other])
+    words.add(second)
+
+    assert list(words) == [first, other]
+    assert second in words
+    assert [w.data1 for w in words] == [frozenset({"pospolita"}), frozenset()]
+
+    words.discard(first)
+    assert list(words) == [other]